@@ -8,6 +8,7 @@ from fastapi.security.oauth2 import OAuth2PasswordRequestFormStrict
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
+from app.core.admission import check_account
 from app.utils import responses
 from app.schemas import user_schemas
 from app.services import auth_service
@@ -23,6 +24,7 @@ async def signup(
     user: user_schemas.UserCreate,
     db: AsyncSession = Depends(get_db)
 ):
+    check_account(user.email)
     new_user =  await auth_service.signup(user, db)
     return new_user
 
@@ -34,6 +36,7 @@ async def login(
     user_credentials: OAuth2PasswordRequestFormStrict = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
+    check_account(user_credentials.username)
     generated_token_response = await auth_service.login(user_credentials, db)
     return generated_token_response
 
@@ -45,4 +48,5 @@ async def delete(
     user_credentials: OAuth2PasswordRequestFormStrict = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
+    check_account(user_credentials.username)
     await auth_service.delete(user_credentials, db)
\ No newline at end of file
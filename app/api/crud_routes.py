@@ -1,21 +1,42 @@
-from typing import List
+from typing import (
+    Annotated,
+    List,
+    Literal,
+    Optional,
+    Union
+)
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
     Query,
+    Request,
+    Response,
     status
 )
 
+from fastapi.responses import StreamingResponse
+
+from pydantic import Field
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.config import app_config
 from app.schemas import (
     crud_schemas,
     user_schemas
 )
-from app.utils import responses
-from app.services import crud_service
+from app.utils import (
+    conditional,
+    responses,
+    serialization
+)
+from app.services import (
+    crud_service,
+    search_service
+)
 
 crud_router = APIRouter(tags = ["CRUD"])
 
@@ -37,23 +58,69 @@ async def create_note(
     response_model = responses.NoteOut
 )
 async def read_note(
+    request: Request,
+    response: Response,
     id: int = Query(..., ge = 1),
-    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
-    db: AsyncSession = Depends(deps.get_db)
+    current_user: user_schemas.TokenData = Depends(deps.get_current_reader),
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
+    if conditional.has_preconditions(request):
+        note_version = await crud_service.read_note_version(id, current_user, db)
+
+        if note_version is not None:
+            version, updated_at = note_version
+            etag = conditional.note_etag(id, version)
+            if conditional.is_not_modified(request, etag, updated_at):
+                return conditional.not_modified(etag, updated_at)
+
     note = await crud_service.read_note(id, current_user, db)
+    conditional.set_validators(response, conditional.note_etag(note["id"], note["version"]), note["updated_at"])
     return note
 
 @crud_router.get(
     "/notes/read-all",
-    response_model = List[responses.NoteOut]
+    response_model = Union[responses.NotePage, responses.NoteSummaryPage, responses.NoteProjectionPage]
 )
 async def read_all_notes(
-    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
-    db: AsyncSession = Depends(deps.get_db)
+    request: Request,
+    limit: int = Query(app_config.default_page_size, ge = 1, le = app_config.max_page_size),
+    cursor: Optional[str] = Query(None),
+    view: Literal["full", "summary"] = Query("full"),
+    fields: Optional[str] = Query(None, description = "Comma-separated note fields to return"),
+    current_user: user_schemas.TokenData = Depends(deps.get_current_reader),
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
-    notes = await crud_service.read_all_notes(current_user, db)
-    return notes
+    selected = crud_service.listing_fields(view, fields)
+
+    if conditional.has_preconditions(request):
+        page_version = await crud_service.read_all_notes_version(current_user, limit, cursor, db)
+        etag = conditional.listing_etag(current_user.id, limit, cursor, selected, page_version)
+        if conditional.is_not_modified(request, etag, None):
+            return conditional.not_modified(etag, None)
+
+    notes = await crud_service.read_all_notes(current_user, limit, cursor, db, selected)
+    etag = conditional.listing_etag(current_user.id, limit, cursor, selected, notes)
+    del notes["version"]
+
+    response = serialization.FastJSONResponse(notes)
+    conditional.set_validators(response, etag, None)
+    return response
+
+@crud_router.get(
+    "/notes/export",
+    response_class = StreamingResponse,
+    responses = {
+        200: {"content": {"application/x-ndjson": {}}}
+    }
+)
+async def export_notes(
+    current_user: user_schemas.TokenData = Depends(deps.get_current_reader),
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    return StreamingResponse(
+        crud_service.export_notes(current_user, db),
+        media_type = "application/x-ndjson"
+    )
 
 @crud_router.put(
     "/notes/update",
@@ -68,6 +135,25 @@ async def update_note(
     updated_note = await crud_service.update_note(id, note, current_user, db)
     return updated_note
 
+@crud_router.patch(
+    "/notes/update",
+    response_model = responses.NoteUpdated,
+    responses = {
+        412: {"description": "The note changed since the ETag in If-Match was issued"}
+    }
+)
+async def patch_note(
+    request: Request,
+    response: Response,
+    note: crud_schemas.PatchNote,
+    id: int = Query(..., ge = 1),
+    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    patched_note = await crud_service.patch_note(id, note, conditional.matched_versions(request, id), current_user, db)
+    conditional.set_validators(response, conditional.note_etag(patched_note.id, patched_note.version), patched_note.updated_at)
+    return patched_note
+
 @crud_router.delete(
     "/notes/delete",
     status_code = status.HTTP_204_NO_CONTENT
@@ -79,6 +165,42 @@ async def delete_note(
 ):
     await crud_service.delete_note(id, current_user, db)
 
+@crud_router.post(
+    "/notes/batch-create",
+    response_model = responses.BatchResult
+)
+async def create_notes(
+    notes: List[crud_schemas.CreateNote],
+    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    results = await crud_service.create_notes(notes, current_user, db)
+    return results
+
+@crud_router.put(
+    "/notes/batch-update",
+    response_model = responses.BatchResult
+)
+async def update_notes(
+    notes: List[crud_schemas.BatchUpdateNote],
+    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    results = await crud_service.update_notes(notes, current_user, db)
+    return results
+
+@crud_router.delete(
+    "/notes/batch-delete",
+    response_model = responses.BatchResult
+)
+async def delete_notes(
+    ids: List[Annotated[int, Field(ge = 1)]] = Body(...),
+    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    results = await crud_service.delete_notes(ids, current_user, db)
+    return results
+
 @crud_router.post(
     "/notes/give-read-access",
     status_code = status.HTTP_201_CREATED,
@@ -109,8 +231,35 @@ async def revoke_read_access(
 )
 async def read_note_with_access(
     note: crud_schemas.ReadableNote,
-    current_user: user_schemas.TokenData = Depends(deps.get_current_user),
-    db: AsyncSession = Depends(deps.get_db)
+    current_user: user_schemas.TokenData = Depends(deps.get_current_reader),
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     note_with_access = await crud_service.read_note_with_access(note, current_user, db)
-    return note_with_access
\ No newline at end of file
+    return note_with_access
+
+@crud_router.get(
+    "/notes/shared-with-me",
+    response_model = responses.SharedNotePage
+)
+async def read_shared_notes(
+    limit: int = Query(app_config.default_page_size, ge = 1, le = app_config.max_page_size),
+    cursor: Optional[str] = Query(None),
+    current_user: user_schemas.TokenData = Depends(deps.get_current_reader),
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    shared_notes = await crud_service.read_shared_notes(current_user, limit, cursor, db)
+    return serialization.FastJSONResponse(shared_notes)
+
+@crud_router.get(
+    "/notes/search",
+    response_model = responses.NoteSearchPage
+)
+async def search_notes(
+    q: str = Query(..., min_length = 1, max_length = 256),
+    limit: int = Query(app_config.default_page_size, ge = 1, le = app_config.max_page_size),
+    offset: int = Query(0, ge = 0),
+    current_user: user_schemas.TokenData = Depends(deps.get_current_reader),
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    results = await search_service.search_notes(q, current_user, limit, offset, db)
+    return serialization.FastJSONResponse(results)
\ No newline at end of file
@@ -1,4 +1,7 @@
-from typing import AsyncGenerator
+from typing import (
+    AsyncGenerator,
+    Optional
+)
 
 from fastapi import (
     HTTPException,
@@ -7,26 +10,66 @@ from fastapi import (
 )
 from fastapi.security.oauth2 import OAuth2PasswordBearer
 
+from jose import (
+    JWTError,
+    jwt
+)
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import user_schemas
-from app.core.security import verify_access_token
+from app.core.security import (
+    token_cache,
+    verify_access_token
+)
+from app.database.replicas import read_router
 from app.database.connection import AsyncSessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl = "auth/login")
 
+def _credentials_exception()-> HTTPException:
+    return HTTPException(
+        status_code = status.HTTP_401_UNAUTHORIZED,
+        detail = "Could not validate credentials",
+        headers = {"WWW-Authenticate": "Bearer"}
+    )
+
+def _token_user_id(token: str)-> Optional[int]:
+    token_data = token_cache.get(token)
+    if token_data is not None:
+        return token_data.id
+
+    try:
+        return jwt.get_unverified_claims(token).get("id")
+    except JWTError:
+        return None
+
 async def get_db()-> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
+async def get_read_db(token: str = Depends(oauth2_scheme))-> AsyncGenerator[AsyncSession, None]:
+    async with (await read_router.session_factory(_token_user_id(token)))() as session:
+        yield session
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 )-> user_schemas.TokenData:
-    credentials_exception = HTTPException(
-        status_code = status.HTTP_401_UNAUTHORIZED,
-        detail = "Could not validate credentials",
-        headers = {"WWW-Authenticate": "Bearer"}
-    )
+    current_user = await verify_access_token(token, db, _credentials_exception())
+    db.info["user_id"] = current_user.id
+
+    return current_user
+
+async def get_current_reader(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db)
+)-> user_schemas.TokenData:
+    try:
+        return await verify_access_token(token, db, _credentials_exception())
+    except HTTPException:
+        if db.bind is AsyncSessionLocal.kw["bind"]:
+            raise
 
-    return await verify_access_token(token, db, credentials_exception)
\ No newline at end of file
+    async with AsyncSessionLocal() as primary:
+        return await verify_access_token(token, primary, _credentials_exception())
\ No newline at end of file
@@ -0,0 +1,179 @@
+import math
+import time
+import asyncio
+
+from typing import (
+    AsyncIterator,
+    Dict,
+    Optional,
+    Tuple
+)
+
+from contextlib import asynccontextmanager
+
+from fastapi import (
+    HTTPException,
+    status
+)
+from fastapi.responses import JSONResponse
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send
+)
+
+from app.utils.cache import TTLCache
+from app.core.config import app_config
+
+class ConcurrencyLimiter:
+    def __init__(
+            self,
+            max_concurrent: int,
+            max_waiting: int,
+            wait_timeout_seconds: float
+    )-> None:
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def _busy(self)-> HTTPException:
+        return HTTPException(
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail = "Server is busy, please retry shortly",
+            headers = {"Retry-After": str(max(1, math.ceil(self.wait_timeout_seconds)))}
+        )
+
+    @asynccontextmanager
+    async def slot(self)-> AsyncIterator[None]:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_waiting:
+                self.rejected += 1
+                raise self._busy()
+
+            self.waiting += 1
+            try:
+                async with asyncio.timeout(self.wait_timeout_seconds):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                self.timeouts += 1
+                raise self._busy()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def snapshot(self)-> Dict[str, int]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts
+        }
+
+class TokenBucketLimiter:
+    def __init__(
+            self,
+            rate_per_second: float,
+            burst: int,
+            max_keys: int
+    )-> None:
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.rejected = 0
+        self._buckets = TTLCache(max_size = max_keys, ttl_seconds = burst / rate_per_second)
+
+    def check(self, key: str)-> None:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate_per_second)
+
+        if tokens < 1:
+            self.rejected += 1
+            raise HTTPException(
+                status_code = status.HTTP_429_TOO_MANY_REQUESTS,
+                detail = "Too many requests, please retry later",
+                headers = {"Retry-After": str(math.ceil((1 - tokens) / self.rate_per_second))}
+            )
+
+        self._buckets.set(key, (tokens - 1, now))
+
+    def snapshot(self)-> Dict[str, int]:
+        return {
+            "keys": len(self._buckets),
+            "rejected": self.rejected
+        }
+
+def _token_bucket(rate_per_second: Optional[float], burst: int)-> Optional[TokenBucketLimiter]:
+    if not rate_per_second:
+        return None
+
+    return TokenBucketLimiter(
+        rate_per_second = rate_per_second,
+        burst = burst,
+        max_keys = app_config.auth_rate_limit_max_keys
+    )
+
+ip_limiter = _token_bucket(app_config.auth_rate_limit_per_ip, app_config.auth_rate_limit_per_ip_burst)
+account_limiter = _token_bucket(app_config.auth_rate_limit_per_account, app_config.auth_rate_limit_per_account_burst)
+
+def _concurrency_limiter()-> ConcurrencyLimiter:
+    return ConcurrencyLimiter(
+        max_concurrent = app_config.auth_max_concurrency,
+        max_waiting = app_config.auth_max_waiting,
+        wait_timeout_seconds = app_config.auth_wait_timeout_seconds
+    )
+
+auth_limiters: Dict[str, ConcurrencyLimiter] = {
+    "signup": _concurrency_limiter(),
+    "login": _concurrency_limiter(),
+    "delete": _concurrency_limiter()
+}
+
+AUTH_ROUTES: Dict[Tuple[str, str], str] = {
+    ("POST", "/auth/signup"): "signup",
+    ("POST", "/auth/login"): "login",
+    ("DELETE", "/auth/delete"): "delete"
+}
+
+def check_account(account: str)-> None:
+    if account_limiter is not None:
+        account_limiter.check(account.strip().lower())
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, routes: Dict[Tuple[str, str], str] = AUTH_ROUTES)-> None:
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send)-> None:
+        endpoint = self.routes.get((scope["method"], scope["path"])) if scope["type"] == "http" else None
+
+        if endpoint is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            if ip_limiter is not None and scope.get("client"):
+                ip_limiter.check(scope["client"][0])
+
+            async with auth_limiters[endpoint].slot():
+                await self.app(scope, receive, send)
+        except HTTPException as exc:
+            response = JSONResponse(
+                status_code = exc.status_code,
+                content = {"detail": exc.detail},
+                headers = exc.headers
+            )
+            await response(scope, receive, send)
\ No newline at end of file
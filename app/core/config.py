@@ -1,3 +1,8 @@
+from typing import (
+    List,
+    Optional
+)
+
 from pydantic_settings import (
     BaseSettings, 
     SettingsConfigDict
@@ -10,10 +15,77 @@ class Config(BaseSettings):
     postgres_host: str
     postgres_port: int
     jwt_secret_key: str
+    database_url: Optional[str] = None
+
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: Optional[int] = None
+    server_backlog: int = 2048
+    server_keep_alive_seconds: int = 5
+    server_graceful_shutdown_seconds: int = 30
+    server_limit_concurrency: Optional[int] = None
+    server_forwarded_allow_ips: str = "127.0.0.1"
+    server_access_log: bool = True
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 100
+    db_command_timeout: Optional[float] = None
+    db_replica_urls: List[str] = []
+    db_replica_selection: str = "round_robin"
+    db_read_your_writes_seconds: float = 5.0
+    db_read_your_writes_max_pinned: int = 10000
+
+    db_connect_retries: int = 10
+    db_connect_backoff_seconds: float = 0.1
+    db_connect_backoff_max_seconds: float = 5.0
+    db_pool_warmup: int = 2
+    readiness_timeout_seconds: float = 2.0
+    metrics_enabled: bool = True
+
+    sql_profiling_enabled: bool = False
+    sql_profiling_slow_request_queries: int = 10
+    sql_profiling_slow_request_ms: float = 500.0
+    sql_profiling_slow_statement_ms: float = 100.0
+    sql_profiling_explain_sample_rate: float = 0.0
+
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 4
+    password_hash_queue_depth: int = 64
+
+    auth_max_concurrency: int = 4
+    auth_max_waiting: int = 16
+    auth_wait_timeout_seconds: float = 5.0
+    auth_rate_limit_per_ip: Optional[float] = None
+    auth_rate_limit_per_ip_burst: int = 20
+    auth_rate_limit_per_account: Optional[float] = None
+    auth_rate_limit_per_account_burst: int = 5
+    auth_rate_limit_max_keys: int = 100000
+
+    auth_cache_ttl_seconds: float = 60.0
+    auth_cache_max_size: int = 10000
+    token_cache_max_size: int = 10000
+
+    default_page_size: int = 50
+    max_page_size: int = 200
+    note_snippet_length: int = 200
+    export_fetch_batch_size: int = 500
+    max_batch_size: int = 500
+
+    note_cache_url: Optional[str] = None
+    note_cache_ttl_seconds: float = 30.0
+    note_cache_max_size: int = 10000
 
     @property
     def postgres_uri(self)-> str:
         return f"""postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"""
+
+    @property
+    def database_uri(self)-> str:
+        return self.database_url or self.postgres_uri
     
     model_config = SettingsConfigDict(env_file=".env")
 
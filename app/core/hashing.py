@@ -0,0 +1,136 @@
+import time
+import asyncio
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple
+)
+
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor
+)
+
+from fastapi import (
+    HTTPException,
+    status
+)
+
+from app.utils import utils
+from app.utils.metrics import (
+    PASSWORD_HASH_BUCKETS,
+    Histogram
+)
+from app.core.config import app_config
+
+def _timed_call(fn: Callable, *args: Any)-> Tuple[Any, float, float]:
+    started = time.monotonic()
+    result = fn(*args)
+
+    return result, started, time.monotonic() - started
+
+class HashingMetrics:
+    def __init__(self)-> None:
+        self.completed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.durations = {operation: Histogram(PASSWORD_HASH_BUCKETS) for operation in ("hash", "verify")}
+        self.waits = {operation: Histogram(PASSWORD_HASH_BUCKETS) for operation in ("hash", "verify")}
+
+    def observe(self, operation: str, wait_seconds: float, hash_seconds: float)-> None:
+        self.durations[operation].observe(hash_seconds)
+        self.waits[operation].observe(wait_seconds)
+        self.completed += 1
+        self.wait_seconds_total += wait_seconds
+        self.hash_seconds_total += hash_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+
+    def snapshot(self)-> Dict[str, float]:
+        return {
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "hash_seconds_total": self.hash_seconds_total,
+            "hash_seconds_max": self.hash_seconds_max
+        }
+
+class PasswordHasher:
+    def __init__(
+            self,
+            executor: str,
+            max_workers: int,
+            queue_depth: int
+    )-> None:
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported password hash executor: {executor}")
+
+        self.executor_kind = executor
+        self.max_workers = max_workers
+        self.max_pending = max_workers + queue_depth
+        self.metrics = HashingMetrics()
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self)-> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers = self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers = self.max_workers,
+                    thread_name_prefix = "password-hasher"
+                )
+
+        return self._executor
+
+    async def _run(self, operation: str, fn: Callable, *args: Any)-> Any:
+        if self.metrics.in_flight >= self.max_pending:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail = "Server is busy, please retry shortly",
+                headers = {"Retry-After": "1"}
+            )
+
+        self.metrics.in_flight += 1
+        submitted = time.monotonic()
+        try:
+            result, started, hash_seconds = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                _timed_call,
+                fn,
+                *args
+            )
+        finally:
+            self.metrics.in_flight -= 1
+
+        self.metrics.observe(operation, started - submitted, hash_seconds)
+
+        return result
+
+    async def hash(self, password: str)-> str:
+        return await self._run("hash", utils.hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str)-> bool:
+        return await self._run("verify", utils.verify_password, plain_password, hashed_password)
+
+    def shutdown(self)-> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait = True, cancel_futures = True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    executor = app_config.password_hash_executor,
+    max_workers = app_config.password_hash_workers,
+    queue_depth = app_config.password_hash_queue_depth
+)
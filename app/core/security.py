@@ -4,7 +4,16 @@ from datetime import (
     timedelta
 )
 
-from typing import Dict
+import time
+import inspect
+
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional
+)
 
 from jose import (
     JWTError,
@@ -17,12 +26,40 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import models
 from app.schemas import user_schemas
+from app.utils.cache import TTLCache
 from app.core.config import app_config
 
 SECRET_KEY = app_config.jwt_secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+principal_cache = TTLCache(
+    max_size = app_config.auth_cache_max_size,
+    ttl_seconds = app_config.auth_cache_ttl_seconds
+)
+token_cache = TTLCache(
+    max_size = app_config.token_cache_max_size,
+    ttl_seconds = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+InvalidationHook = Callable[[int], Optional[Awaitable[None]]]
+
+_invalidation_hooks: List[InvalidationHook] = []
+
+def register_invalidation_hook(hook: InvalidationHook)-> None:
+    _invalidation_hooks.append(hook)
+
+async def invalidate_user(user_id: int, propagate: bool = True)-> None:
+    principal_cache.delete(user_id)
+
+    if not propagate:
+        return
+
+    for hook in _invalidation_hooks:
+        result = hook(user_id)
+        if inspect.isawaitable(result):
+            await result
+
 
 def create_access_token(data: Dict)-> str:
     to_encode = data.copy()
@@ -40,27 +77,39 @@ async def verify_access_token(
         credential_exception: Exception
 )-> user_schemas.TokenData:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms = [ALGORITHM])
+        token_data = token_cache.get(token)
+
+        if token_data is None:
+            payload = jwt.decode(token, SECRET_KEY, algorithms = [ALGORITHM])
+
+            id = payload.get("id")
+            email = payload.get("email")
 
-        id = payload.get("id")
-        email = payload.get("email")
+            if id is None:
+                raise credential_exception
 
-        if id is None:
-            raise credential_exception
-        
-        user = (
-            await db.execute(
-                select(models.User).where(models.User.id == id)
+            token_data = user_schemas.TokenData(
+                id = id,
+                email = email
             )
-        ).scalar_one_or_none()
-
-        if not user:
-            raise credential_exception
-        
-        token_data = user_schemas.TokenData(
-            id = id,
-            email = email
-        )
+            expires_at = payload.get("exp")
+            token_cache.set(
+                token,
+                token_data,
+                ttl_seconds = expires_at - time.time() if expires_at else None
+            )
+
+        if principal_cache.get(token_data.id) is None:
+            user_id = (
+                await db.execute(
+                    select(models.User.id).where(models.User.id == token_data.id)
+                )
+            ).scalar_one_or_none()
+
+            if user_id is None:
+                raise credential_exception
+
+            principal_cache.set(token_data.id, True)
 
         return token_data
     except JWTError:
@@ -1,17 +1,85 @@
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List
+)
+
+from sqlalchemy import event
+from sqlalchemy.engine import (
+    URL,
+    make_url
+)
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
     create_async_engine,
     async_sessionmaker
 )
 
 from app.core.config import app_config
+from app.database.pool import InstrumentedAsyncQueuePool
 
-engine = create_async_engine(
-    app_config.postgres_uri,
-    future = True
-)
+def _connect_args(url: URL)-> Dict[str, Any]:
+    if url.get_driver_name() != "asyncpg":
+        return {}
+
+    return {
+        "prepared_statement_cache_size": app_config.db_statement_cache_size,
+        "statement_cache_size": app_config.db_statement_cache_size,
+        "command_timeout": app_config.db_command_timeout
+    }
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record)-> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.close()
+
+def create_engine(url: str)-> AsyncEngine:
+    database_url = make_url(url)
+
+    new_engine = create_async_engine(
+        database_url,
+        future = True,
+        poolclass = InstrumentedAsyncQueuePool,
+        pool_size = app_config.db_pool_size,
+        max_overflow = app_config.db_max_overflow,
+        pool_timeout = app_config.db_pool_timeout,
+        pool_recycle = app_config.db_pool_recycle,
+        pool_pre_ping = app_config.db_pool_pre_ping,
+        connect_args = _connect_args(database_url)
+    )
+
+    if database_url.get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+
+    return new_engine
+
+commit_hooks: List[Callable[[AsyncSession], Awaitable[None]]] = []
+
+class PrimaryAsyncSession(AsyncSession):
+    async def commit(self)-> None:
+        await super().commit()
+
+        for hook in commit_hooks:
+            await hook(self)
+
+engine = create_engine(app_config.database_uri)
+replica_engines = [create_engine(url) for url in app_config.db_replica_urls]
 
 AsyncSessionLocal = async_sessionmaker(
     bind = engine,
     autoflush = False,
-    expire_on_commit = False
-)
\ No newline at end of file
+    expire_on_commit = False,
+    class_ = PrimaryAsyncSession
+)
+ReplicaSessionLocals = [
+    async_sessionmaker(
+        bind = replica_engine,
+        autoflush = False,
+        expire_on_commit = False,
+        info = {"replica": True}
+    )
+    for replica_engine in replica_engines
+]
\ No newline at end of file
@@ -0,0 +1,194 @@
+import re
+import asyncio
+import argparse
+import logging
+import importlib
+
+from types import ModuleType
+from typing import (
+    AsyncIterator,
+    List,
+    Optional,
+    Set
+)
+
+from pathlib import Path
+from contextlib import asynccontextmanager
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+    text
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine
+)
+
+from app.utils import utils
+from app.core.config import app_config
+from app.database.connection import engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.database.migrations"
+MIGRATIONS_DIRECTORY = Path(__file__).parent / "migrations"
+MIGRATION_FILE = re.compile(r"^\d{4}_\w+\.py$")
+MIGRATION_LOCK_ID = 4862713
+MIGRATION_LOCK_POLL_SECONDS = 1.0
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(255), primary_key = True),
+    Column("applied_at", DateTime(timezone = True), server_default = func.now())
+)
+
+def load_migrations()-> List[ModuleType]:
+    return [
+        importlib.import_module(f"{MIGRATIONS_PACKAGE}.{path.stem}")
+        for path in sorted(MIGRATIONS_DIRECTORY.glob("*.py"))
+        if MIGRATION_FILE.match(path.name)
+    ]
+
+def migration_version(migration: ModuleType)-> str:
+    return migration.__name__.rsplit(".", 1)[1]
+
+async def create_index(
+        conn: AsyncConnection,
+        name: str,
+        table: str,
+        columns: str,
+        unique: bool = False,
+        using: Optional[str] = None,
+        include: Optional[str] = None
+)-> None:
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+
+    if conn.dialect.name != "postgresql":
+        await conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})"))
+        return
+
+    valid = (
+        await conn.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": name}
+        )
+    ).scalar_one_or_none()
+
+    if valid is False:
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    await conn.execute(text(
+        f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table}"
+        + (f" USING {using}" if using else "")
+        + f" ({columns})"
+        + (f" INCLUDE ({include})" if include else "")
+    ))
+
+async def constraint_exists(conn: AsyncConnection, name: str)-> bool:
+    return (
+        await conn.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = :name)"),
+            {"name": name}
+        )
+    ).scalar_one()
+
+@asynccontextmanager
+async def migration_lock(target: AsyncEngine)-> AsyncIterator[None]:
+    if target.dialect.name != "postgresql":
+        yield
+        return
+
+    async with target.connect() as conn:
+        await conn.execution_options(isolation_level = "AUTOCOMMIT")
+        while not (await conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})).scalar_one():
+            logger.info("Waiting for another migration run to finish")
+            await asyncio.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+        try:
+            yield
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+async def applied_versions(conn: AsyncConnection)-> Set[str]:
+    if not await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(schema_migrations.name)):
+        return set()
+
+    return set((await conn.execute(select(schema_migrations.c.version))).scalars())
+
+async def pending_migrations(target: AsyncEngine)-> List[str]:
+    async with target.connect() as conn:
+        applied = await applied_versions(conn)
+
+    return [
+        migration_version(migration)
+        for migration in load_migrations()
+        if migration_version(migration) not in applied
+    ]
+
+async def apply_migration(target: AsyncEngine, migration: ModuleType)-> None:
+    async with target.connect() as conn:
+        if not getattr(migration, "TRANSACTIONAL", True):
+            await conn.execution_options(isolation_level = "AUTOCOMMIT")
+
+        async with conn.begin():
+            await migration.upgrade(conn)
+            await conn.execute(insert(schema_migrations).values(version = migration_version(migration)))
+
+async def migrate(target: AsyncEngine)-> List[str]:
+    migrations = load_migrations()
+
+    async with migration_lock(target):
+        async with target.begin() as conn:
+            applied = await applied_versions(conn)
+            legacy = not applied and await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("users"))
+            await conn.run_sync(schema_migrations.create, checkfirst = True)
+
+            if legacy:
+                baseline = migration_version(migrations[0])
+                await conn.execute(insert(schema_migrations).values(version = baseline))
+                applied.add(baseline)
+                logger.info("Found a schema created before migrations, recorded %s as applied", baseline)
+
+        pending = [migration for migration in migrations if migration_version(migration) not in applied]
+
+        for migration in pending:
+            logger.info("Applying %s", migration_version(migration))
+            await apply_migration(target, migration)
+
+    return [migration_version(migration) for migration in pending]
+
+async def main(status: bool)-> None:
+    await utils.wait_for_db(
+        engine,
+        retries = app_config.db_connect_retries,
+        backoff_seconds = app_config.db_connect_backoff_seconds,
+        backoff_max_seconds = app_config.db_connect_backoff_max_seconds
+    )
+
+    try:
+        if status:
+            for version in await pending_migrations(engine):
+                logger.info("Pending %s", version)
+        else:
+            applied = await migrate(engine)
+            logger.info("Applied %d migrations", len(applied))
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Apply pending schema migrations to the configured database")
+    parser.add_argument("--status", action = "store_true", help = "list pending migrations without applying them")
+    args = parser.parse_args()
+
+    logging.basicConfig(format = "%(asctime)s %(levelname)s %(message)s")
+    logger.setLevel(logging.INFO)
+    asyncio.run(main(args.status))
\ No newline at end of file
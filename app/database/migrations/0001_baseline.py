@@ -0,0 +1,47 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key = True),
+    Column("email", String(255), unique = True, index = True, nullable = False),
+    Column("password", String(255), nullable = False),
+    Column("created_at", DateTime(timezone = True), server_default = func.now(), nullable = False)
+)
+
+Table(
+    "notes",
+    metadata,
+    Column("id", Integer, primary_key = True),
+    Column("owner_id", Integer, ForeignKey("users.id", ondelete = "CASCADE"), nullable = False),
+    Column("title", String(50), nullable = False),
+    Column("content", Text, nullable = True),
+    Column("created_at", DateTime(timezone = True), server_default = func.now(), nullable = False),
+    Column("updated_at", DateTime(timezone = True), server_default = func.now(), nullable = False)
+)
+
+Table(
+    "note_read_access",
+    metadata,
+    Column("id", Integer, primary_key = True),
+    Column("user_id", Integer, nullable = False),
+    Column("note_owner_id", Integer, nullable = False),
+    Column("note_id", Integer, nullable = False),
+    Column("granted_at", DateTime(timezone = True), server_default = func.now(), nullable = False)
+)
+
+async def upgrade(conn: AsyncConnection)-> None:
+    await conn.run_sync(metadata.create_all)
\ No newline at end of file
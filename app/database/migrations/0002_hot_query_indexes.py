@@ -0,0 +1,24 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database.migrate import (
+    constraint_exists,
+    create_index
+)
+
+TRANSACTIONAL = False
+
+async def upgrade(conn: AsyncConnection)-> None:
+    await create_index(conn, "uq_notes_owner_id_id", "notes", "owner_id, id", unique = True)
+    await create_index(conn, "ix_notes_owner_id_updated_at_id", "notes", "owner_id, updated_at, id")
+    await create_index(conn, "ix_note_read_access_user_id_note_id", "note_read_access", "user_id, note_id")
+    await create_index(
+        conn,
+        "ix_note_read_access_user_id_granted_at",
+        "note_read_access",
+        "user_id, granted_at, id",
+        include = "note_id, note_owner_id"
+    )
+
+    if conn.dialect.name == "postgresql" and not await constraint_exists(conn, "uq_notes_owner_id_id"):
+        await conn.execute(text("ALTER TABLE notes ADD CONSTRAINT uq_notes_owner_id_id UNIQUE USING INDEX uq_notes_owner_id_id"))
\ No newline at end of file
@@ -0,0 +1,33 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database.migrate import create_index
+
+TRANSACTIONAL = False
+
+SQLITE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(title, content, content = 'notes', content_rowid = 'id')",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN "
+    "INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN "
+    "INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE ON notes BEGIN "
+    "INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')"
+)
+
+async def upgrade(conn: AsyncConnection)-> None:
+    if conn.dialect.name == "sqlite":
+        for statement in SQLITE_STATEMENTS:
+            await conn.execute(text(statement))
+        return
+
+    await conn.execute(text(
+        "ALTER TABLE notes ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))) STORED"
+    ))
+    await create_index(conn, "ix_notes_search_vector", "notes", "search_vector", using = "GIN")
\ No newline at end of file
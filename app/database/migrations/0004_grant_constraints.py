@@ -0,0 +1,56 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession
+)
+
+from app.jobs import purge_orphan_grants
+from app.database.migrate import (
+    constraint_exists,
+    create_index
+)
+
+TRANSACTIONAL = False
+
+FOREIGN_KEYS = {
+    "note_read_access_user_id_fkey": "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+    "fk_note_read_access_note": "FOREIGN KEY (note_owner_id, note_id) REFERENCES notes (owner_id, id) ON DELETE CASCADE"
+}
+
+async def upgrade(conn: AsyncConnection)-> None:
+    postgres = conn.dialect.name == "postgresql"
+
+    if postgres:
+        for name, definition in FOREIGN_KEYS.items():
+            if not await constraint_exists(conn, name):
+                await conn.execute(text(f"ALTER TABLE note_read_access ADD CONSTRAINT {name} {definition} NOT VALID"))
+
+    async with AsyncSession(bind = conn) as db:
+        await purge_orphan_grants.purge(db, batch_size = 1000)
+
+    await conn.execute(text(
+        "DELETE FROM note_read_access WHERE id IN ("
+        "SELECT duplicate.id FROM note_read_access AS duplicate "
+        "JOIN note_read_access AS original "
+        "ON original.note_id = duplicate.note_id "
+        "AND original.user_id = duplicate.user_id "
+        "AND original.note_owner_id = duplicate.note_owner_id "
+        "AND original.id < duplicate.id)"
+    ))
+    await create_index(
+        conn,
+        "uq_note_read_access_note_user_owner",
+        "note_read_access",
+        "note_id, user_id, note_owner_id",
+        unique = True
+    )
+
+    if postgres:
+        if not await constraint_exists(conn, "uq_note_read_access_note_user_owner"):
+            await conn.execute(text(
+                "ALTER TABLE note_read_access ADD CONSTRAINT uq_note_read_access_note_user_owner "
+                "UNIQUE USING INDEX uq_note_read_access_note_user_owner"
+            ))
+
+        for name in FOREIGN_KEYS:
+            await conn.execute(text(f"ALTER TABLE note_read_access VALIDATE CONSTRAINT {name}"))
\ No newline at end of file
@@ -0,0 +1,11 @@
+from sqlalchemy import (
+    inspect,
+    text
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+async def upgrade(conn: AsyncConnection)-> None:
+    columns = await conn.run_sync(lambda sync_conn: {column["name"] for column in inspect(sync_conn).get_columns("notes")})
+
+    if "version" not in columns:
+        await conn.execute(text("ALTER TABLE notes ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
\ No newline at end of file
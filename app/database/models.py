@@ -3,11 +3,17 @@ from typing import List
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     String,
     Integer,
     ForeignKey,
+    ForeignKeyConstraint,
     Text,
     DateTime,
+    Index,
+    literal_column,
+    UniqueConstraint,
+    event,
     func
 )
 from sqlalchemy.orm import (
@@ -30,7 +36,8 @@ class User(Base):
 
     notes: Mapped[List["Note"]] = relationship(
         back_populates = "user", 
-        cascade = "all, delete-orphan"
+        cascade = "all, delete-orphan",
+        passive_deletes = True
     )
 
 class Note(Base):
@@ -42,58 +49,79 @@ class Note(Base):
     content: Mapped[str] = mapped_column(Text, nullable = True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), server_default = func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), server_default = func.now(), onupdate = func.now())
+    version: Mapped[int] = mapped_column(Integer, nullable = False, server_default = "1", onupdate = literal_column("version + 1"))
 
     user: Mapped["User"] = relationship(
         back_populates = "notes"
     )
 
+    __table_args__ = (
+        Index("ix_notes_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        UniqueConstraint("owner_id", "id", name = "uq_notes_owner_id_id"),
+    )
+
 
 class NoteReadAccess(Base):
     __tablename__ = "note_read_access"
  
     id: Mapped[int] = mapped_column(primary_key = True)
-    user_id: Mapped[int] = mapped_column(Integer, nullable = False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete = "CASCADE"), nullable = False)
     note_owner_id: Mapped[int] = mapped_column(Integer, nullable = False)
     note_id: Mapped[int] = mapped_column(Integer, nullable = False)
     granted_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), server_default = func.now())
 
+    __table_args__ = (
+        UniqueConstraint("note_id", "user_id", "note_owner_id", name = "uq_note_read_access_note_user_owner"),
+        ForeignKeyConstraint(
+            ["note_owner_id", "note_id"],
+            ["notes.owner_id", "notes.id"],
+            ondelete = "CASCADE",
+            name = "fk_note_read_access_note"
+        ),
+        Index("ix_note_read_access_user_id_note_id", "user_id", "note_id"),
+        Index(
+            "ix_note_read_access_user_id_granted_at",
+            "user_id",
+            "granted_at",
+            "id",
+            postgresql_include = ["note_id", "note_owner_id"]
+        ),
+    )
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    
\ No newline at end of file
+NOTES_SEARCH_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(content, '')"
+
+for ddl in (
+    DDL(
+        "ALTER TABLE notes ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('english', {NOTES_SEARCH_DOCUMENT})) STORED"
+    ).execute_if(dialect = "postgresql"),
+    DDL(
+        "CREATE INDEX ix_notes_search_vector ON notes USING GIN (search_vector)"
+    ).execute_if(dialect = "postgresql"),
+    DDL(
+        "CREATE VIRTUAL TABLE notes_fts USING fts5(title, content, content = 'notes', content_rowid = 'id')"
+    ).execute_if(dialect = "sqlite"),
+    DDL(
+        "CREATE TRIGGER notes_fts_ai AFTER INSERT ON notes BEGIN "
+        "INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+        "END"
+    ).execute_if(dialect = "sqlite"),
+    DDL(
+        "CREATE TRIGGER notes_fts_ad AFTER DELETE ON notes BEGIN "
+        "INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+        "END"
+    ).execute_if(dialect = "sqlite"),
+    DDL(
+        "CREATE TRIGGER notes_fts_au AFTER UPDATE ON notes BEGIN "
+        "INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+        "INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content); "
+        "END"
+    ).execute_if(dialect = "sqlite")
+):
+    event.listen(Note.__table__, "after_create", ddl)
+
+event.listen(
+    Note.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS notes_fts").execute_if(dialect = "sqlite")
+)
@@ -0,0 +1,68 @@
+import time
+
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.metrics import (
+    POOL_WAIT_BUCKETS,
+    Histogram
+)
+
+class PoolMetrics:
+    def __init__(self)-> None:
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+        self.checkout_wait = Histogram(POOL_WAIT_BUCKETS)
+
+    def observe(self, wait_seconds: float)-> None:
+        self.checkout_wait.observe(wait_seconds)
+        self.checkouts += 1
+        self.checkout_wait_seconds_total += wait_seconds
+        self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, wait_seconds)
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs)-> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        self.metrics.waiting += 1
+        started = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.waiting -= 1
+
+        self.metrics.observe(time.monotonic() - started)
+
+        return connection
+
+def pool_status(engine: AsyncEngine)-> Dict[str, float]:
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow()
+    }
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update({
+            "waiting": metrics.waiting,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "checkout_wait_seconds_total": metrics.checkout_wait_seconds_total,
+            "checkout_wait_seconds_max": metrics.checkout_wait_seconds_max
+        })
+
+    return status
@@ -0,0 +1,93 @@
+import itertools
+
+from typing import (
+    List,
+    Optional
+)
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker
+)
+
+from app.utils.cache import (
+    TTLCache,
+    create_cache_backend,
+    is_shared_cache
+)
+from app.core.config import app_config
+from app.database.connection import (
+    AsyncSessionLocal,
+    ReplicaSessionLocals,
+    commit_hooks
+)
+
+def _pin_key(user_id: int)-> str:
+    return f"pin:{user_id}"
+
+class ReplicaRouter:
+    def __init__(
+            self,
+            primary: async_sessionmaker,
+            replicas: List[async_sessionmaker],
+            selection: str,
+            pin_seconds: float,
+            max_pinned: int,
+            shared_pins = None
+    )-> None:
+        if selection not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unsupported replica selection: {selection}")
+
+        self.primary = primary
+        self.replicas = replicas
+        self.selection = selection
+        self.pin_seconds = pin_seconds
+        self.shared_pins = shared_pins
+        self._cycle = itertools.cycle(replicas)
+        self._pinned = TTLCache(max_size = max_pinned, ttl_seconds = pin_seconds)
+
+    async def pin(self, user_id: int)-> None:
+        self._pinned.set(user_id, True)
+
+        if self.shared_pins is not None:
+            await self.shared_pins.set(_pin_key(user_id), b"1", self.pin_seconds)
+
+    async def is_pinned(self, user_id: int)-> bool:
+        if self._pinned.get(user_id):
+            return True
+
+        if self.shared_pins is None:
+            return False
+
+        (pinned,) = await self.shared_pins.get_many([_pin_key(user_id)])
+        return pinned is not None
+
+    async def session_factory(self, user_id: Optional[int])-> async_sessionmaker:
+        if not self.replicas or (user_id is not None and await self.is_pinned(user_id)):
+            return self.primary
+
+        if self.selection == "least_busy":
+            return min(self.replicas, key = lambda replica: replica.kw["bind"].pool.checkedout())
+
+        return next(self._cycle)
+
+read_router = ReplicaRouter(
+    primary = AsyncSessionLocal,
+    replicas = ReplicaSessionLocals,
+    selection = app_config.db_replica_selection,
+    pin_seconds = app_config.db_read_your_writes_seconds,
+    max_pinned = app_config.db_read_your_writes_max_pinned,
+    shared_pins = (
+        create_cache_backend(app_config.note_cache_url, max_size = 0, ttl_seconds = app_config.db_read_your_writes_seconds)
+        if ReplicaSessionLocals and is_shared_cache(app_config.note_cache_url)
+        else None
+    )
+)
+
+async def _pin_writer(session: AsyncSession)-> None:
+    user_id = session.info.get("user_id")
+
+    if user_id is not None and read_router.replicas:
+        await read_router.pin(user_id)
+
+commit_hooks.append(_pin_writer)
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import json
+import asyncio
+import argparse
+import logging
+
+from typing import (
+    Optional,
+    Tuple
+)
+
+from sqlalchemy import (
+    ColumnElement,
+    delete,
+    exists,
+    func,
+    or_,
+    select
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import models
+from app.database.connection import (
+    AsyncSessionLocal,
+    engine
+)
+
+logger = logging.getLogger(__name__)
+
+def _orphaned()-> ColumnElement[bool]:
+    return or_(
+        ~exists().where(models.User.id == models.NoteReadAccess.user_id),
+        ~exists().where(
+            models.Note.id == models.NoteReadAccess.note_id,
+            models.Note.owner_id == models.NoteReadAccess.note_owner_id
+        )
+    )
+
+def read_checkpoint(path: Optional[str])-> int:
+    if not path or not os.path.exists(path):
+        return 0
+
+    with open(path) as checkpoint:
+        return json.load(checkpoint)["after_id"]
+
+def write_checkpoint(path: Optional[str], after_id: int)-> None:
+    if not path:
+        return
+
+    with open(f"{path}.tmp", "w") as checkpoint:
+        json.dump({"after_id": after_id}, checkpoint)
+    os.replace(f"{path}.tmp", path)
+
+async def purge_batch(
+        db: AsyncSession,
+        after_id: int,
+        batch_size: int
+)-> Tuple[Optional[int], int]:
+
+    window = (
+        select(models.NoteReadAccess.id)
+        .where(models.NoteReadAccess.id > after_id)
+        .order_by(models.NoteReadAccess.id)
+        .limit(batch_size)
+        .subquery()
+    )
+    last_id = (await db.execute(select(func.max(window.c.id)))).scalar_one_or_none()
+
+    if last_id is None:
+        return None, 0
+
+    deleted = (
+        await db.execute(
+            delete(models.NoteReadAccess)
+            .where(
+                models.NoteReadAccess.id > after_id,
+                models.NoteReadAccess.id <= last_id,
+                _orphaned()
+            )
+            .returning(models.NoteReadAccess.id)
+        )
+    ).scalars().all()
+    await db.commit()
+
+    return last_id, len(deleted)
+
+async def purge(
+        db: AsyncSession,
+        batch_size: int,
+        pause_seconds: float = 0.0,
+        checkpoint: Optional[str] = None
+)-> int:
+    after_id = read_checkpoint(checkpoint)
+    total = 0
+
+    while True:
+        last_id, deleted = await purge_batch(db, after_id, batch_size)
+        if last_id is None:
+            break
+
+        after_id = last_id
+        total += deleted
+        write_checkpoint(checkpoint, after_id)
+        logger.info("Scanned grants up to id %d, deleted %d orphans (%d total)", after_id, deleted, total)
+
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
+
+    return total
+
+async def purge_orphan_grants(
+        batch_size: int,
+        pause_seconds: float,
+        checkpoint: Optional[str]
+)-> int:
+    async with AsyncSessionLocal() as db:
+        total = await purge(db, batch_size, pause_seconds, checkpoint)
+
+    await engine.dispose()
+
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Delete read grants whose reader, note or note owner no longer exists")
+    parser.add_argument("--batch-size", type = int, default = 1000)
+    parser.add_argument("--pause-seconds", type = float, default = 0.0, help = "sleep between batches to limit load")
+    parser.add_argument("--checkpoint", help = "file recording the last scanned grant id; the job resumes from it")
+    args = parser.parse_args()
+
+    logging.basicConfig(format = "%(asctime)s %(levelname)s %(message)s")
+    logger.setLevel(logging.INFO)
+    total = asyncio.run(purge_orphan_grants(args.batch_size, args.pause_seconds, args.checkpoint))
+    logger.info("Done, deleted %d orphaned grants", total)
\ No newline at end of file
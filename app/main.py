@@ -1,28 +1,94 @@
 import asyncio
+import logging
 
-from typing import AsyncIterator
+from typing import (
+    AsyncIterator,
+    Dict
+)
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import (
+    FastAPI,
+    status
+)
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse
+)
 
-from app.utils import utils
-from app.database.connection import engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils import (
+    metrics,
+    profiling,
+    utils
+)
+from app.core.config import app_config
+from app.core import admission
+from app.core.hashing import password_hasher
+from app.core.security import (
+    principal_cache,
+    token_cache
+)
+from app.services.note_cache import note_cache
+from app.database.pool import pool_status
+from app.database.replicas import read_router
+from app.database.connection import (
+    engine,
+    replica_engines
+)
 from app.api.auth_routes import auth_router
 from app.api.crud_routes import crud_router
 from app.utils.exceptions import register_exception_handler
 
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI)-> AsyncIterator[None]:
-    await asyncio.sleep(5)
-    await utils.init_db(engine)
+    app.state.ready = False
+
+    await utils.wait_for_db(
+        engine,
+        retries = app_config.db_connect_retries,
+        backoff_seconds = app_config.db_connect_backoff_seconds,
+        backoff_max_seconds = app_config.db_connect_backoff_max_seconds
+    )
+    await utils.warm_pool(engine, min(app_config.db_pool_warmup, app_config.db_pool_size))
+
+    app.state.ready = True
 
-    yield
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        password_hasher.shutdown()
+        await note_cache.backend.close()
+        if read_router.shared_pins is not None:
+            await read_router.shared_pins.close()
+        for replica_engine in replica_engines:
+            await replica_engine.dispose()
+        await engine.dispose()
 
 app = FastAPI(lifespan = lifespan)
 
 app.include_router(auth_router)
 app.include_router(crud_router)
+app.add_middleware(admission.AdmissionMiddleware)
+
+if app_config.sql_profiling_enabled:
+    for profiled_engine in (engine, *replica_engines):
+        profiling.install_query_profiler(profiled_engine, app_config.sql_profiling_slow_statement_ms / 1000)
+    app.add_middleware(
+        profiling.ProfilingMiddleware,
+        engine = engine,
+        slow_request_queries = app_config.sql_profiling_slow_request_queries,
+        slow_request_ms = app_config.sql_profiling_slow_request_ms,
+        explain_sample_rate = app_config.sql_profiling_explain_sample_rate
+    )
+
+if app_config.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware, routes = app.routes)
     
 @app.get("/")
 def hello():
@@ -32,4 +98,71 @@ def hello():
 def health():
     return {"message": "Healthy"}
 
+@app.get("/health/live")
+def health_live():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def health_ready():
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+            content = {"status": "not_ready"}
+        )
+
+    try:
+        async with asyncio.timeout(app_config.readiness_timeout_seconds):
+            await utils.ping_db(engine)
+    except Exception as exc:
+        logger.warning("Readiness check failed", exc_info = exc)
+        return JSONResponse(
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+            content = {
+                "status": "unavailable",
+                "pool": pool_status(engine)
+            }
+        )
+
+    return {
+        "status": "ready",
+        "pool": pool_status(engine)
+    }
+
+def database_engines()-> Dict[str, AsyncEngine]:
+    return {
+        "primary": engine,
+        **{f"replica-{index}": replica_engine for index, replica_engine in enumerate(replica_engines)}
+    }
+
+@app.get("/health/pool")
+def health_pool():
+    return {
+        **pool_status(engine),
+        "replicas": [pool_status(replica_engine) for replica_engine in replica_engines]
+    }
+
+@app.get("/health/cache")
+def health_cache():
+    return {
+        "notes": note_cache.snapshot(),
+        "principals": principal_cache.snapshot(),
+        "tokens": token_cache.snapshot()
+    }
+
+@app.get("/metrics", include_in_schema = False)
+def read_metrics():
+    return PlainTextResponse(
+        metrics.render_metrics(
+            metrics.http_metrics,
+            {
+                name: (pool_status(pool_engine), getattr(pool_engine.pool, "metrics", None))
+                for name, pool_engine in database_engines().items()
+            },
+            password_hasher.metrics,
+            admission.auth_limiters,
+            {"ip": admission.ip_limiter, "account": admission.account_limiter}
+        ),
+        media_type = metrics.CONTENT_TYPE
+    )
+
 register_exception_handler(app)
\ No newline at end of file
@@ -5,7 +5,8 @@ from typing import (
 
 from pydantic import (
     BaseModel,
-    Field
+    Field,
+    field_validator
 )
 
 class CreateNote(BaseModel):
@@ -16,6 +17,21 @@ class UpdateNote(BaseModel):
     title: Optional[str] = Field(default = None, max_length = 50)
     content: Optional[str] = Field(default = None)
 
+class PatchNote(BaseModel):
+    title: Optional[str] = Field(default = None, max_length = 50)
+    content: Optional[str] = Field(default = None)
+
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, title: Optional[str])-> str:
+        if title is None:
+            raise ValueError("title cannot be null")
+
+        return title
+
+class BatchUpdateNote(UpdateNote):
+    id: Annotated[int, Field(ge = 1)]
+
 class CreateNoteReadAccess(BaseModel):
     user_id: Annotated[int, Field(ge = 1)]
     note_id: Annotated[int, Field(ge = 1)]
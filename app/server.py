@@ -0,0 +1,56 @@
+import os
+
+from typing import (
+    Any,
+    Dict
+)
+
+from importlib.util import find_spec
+from urllib.parse import urlparse
+
+import uvicorn
+
+from app.core.config import app_config
+from app.utils.cache import is_shared_cache
+
+def _installed(module: str)-> bool:
+    return find_spec(module) is not None
+
+def server_options()-> Dict[str, Any]:
+    return {
+        "host": app_config.server_host,
+        "port": app_config.server_port,
+        "workers": app_config.server_workers or os.cpu_count() or 1,
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "backlog": app_config.server_backlog,
+        "timeout_keep_alive": app_config.server_keep_alive_seconds,
+        "timeout_graceful_shutdown": app_config.server_graceful_shutdown_seconds,
+        "limit_concurrency": app_config.server_limit_concurrency,
+        "proxy_headers": True,
+        "forwarded_allow_ips": app_config.server_forwarded_allow_ips,
+        "access_log": app_config.server_access_log
+    }
+
+def check_worker_state(workers: int)-> None:
+    if workers > 1 and urlparse(app_config.note_cache_url or "").scheme == "memory":
+        raise SystemExit(
+            "NOTE_CACHE_URL=memory:// keeps a separate cache in each worker, so a write handled by one worker "
+            "leaves stale notes cached in the others; use a redis:// cache or SERVER_WORKERS=1"
+        )
+
+    if workers > 1 and app_config.db_replica_urls and not is_shared_cache(app_config.note_cache_url):
+        raise SystemExit(
+            "DB_REPLICA_URLS with several workers needs a redis:// NOTE_CACHE_URL to share read-your-writes pins; "
+            "without one a read served by another worker can go to a lagging replica right after a write. "
+            "Set NOTE_CACHE_URL or SERVER_WORKERS=1"
+        )
+
+def main()-> None:
+    options = server_options()
+    check_worker_state(options["workers"])
+
+    uvicorn.run("app.main:app", **options)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
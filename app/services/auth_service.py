@@ -6,38 +6,46 @@ from fastapi import (
 )
 from fastapi.security.oauth2 import OAuth2PasswordRequestFormStrict
 
-from sqlalchemy import select
+from sqlalchemy import (
+    delete as sql_delete,
+    select
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utils import utils
 from app.database import models
 from app.schemas import user_schemas
-from app.core.security import create_access_token
+from app.core.hashing import password_hasher
+from app.services.note_cache import note_cache
+from app.core.security import (
+    create_access_token,
+    invalidate_user
+)
 
 async def signup(
         user: user_schemas.UserCreate, 
         db: AsyncSession
 )-> models.User:
 
-    existing_user = (
+    hashed_password = await password_hasher.hash(user.password)
+    user.password = hashed_password
+
+    new_user = (
         await db.execute(
-        select(models.User).where(models.User.email == user.email)
-    )
+            insert(models.User)
+            .values(**user.model_dump())
+            .on_conflict_do_nothing(index_elements = [models.User.email])
+            .returning(models.User)
+        )
     ).scalar_one_or_none()
 
-    if existing_user:
+    if not new_user:
         raise HTTPException(
             status_code = status.HTTP_409_CONFLICT,
             detail = "User with this email already exists"
         )
-    
-    hashed_password = utils.hash_password(user.password)
-    user.password = hashed_password
-    
-    new_user = models.User(**user.model_dump())
-    db.add(new_user)
+
     await db.commit()
-    await db.refresh(new_user)
     return new_user
 
 async def login(
@@ -57,7 +65,10 @@ async def login(
             detail = "Invalid credentials"
         )
 
-    if not utils.verify_password(user_credentials.password, user.password):
+    user_id, user_email, user_password = user.id, user.email, user.password
+    await db.rollback()
+
+    if not await password_hasher.verify(user_credentials.password, user_password):
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail = "Invalid credentials"
@@ -65,8 +76,8 @@ async def login(
 
     token = create_access_token(
         {
-            "id": user.id,
-            "email": user.email
+            "id": user_id,
+            "email": user_email
         }
     )
 
@@ -90,12 +101,18 @@ async def delete(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail = "Invalid credentials"
         )
-    
-    if not utils.verify_password(user_credentials.password, user.password):
+
+    user_id, user_password = user.id, user.password
+    await db.rollback()
+
+    if not await password_hasher.verify(user_credentials.password, user_password):
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail = "Invalid credentials"
         )
     
-    await db.delete(user)
-    await db.commit()
\ No newline at end of file
+    await db.execute(sql_delete(models.User).where(models.User.id == user_id))
+    await db.commit()
+
+    await invalidate_user(user_id)
+    await note_cache.invalidate_owner(user_id)
\ No newline at end of file
@@ -1,33 +1,83 @@
-from typing import List
+from typing import (
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from datetime import datetime
 
 from fastapi import (
     HTTPException,
     status
 )
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    and_,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    tuple_,
+    update
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.utils import (
+    conditional,
+    pagination,
+    serialization
+)
 from app.database import models
+from app.core.config import app_config
+from app.services.note_cache import (
+    note_cache,
+    note_payload
+)
 from app.schemas import (
     user_schemas,
     crud_schemas
 )
 
+NOTE_OUT_COLUMNS = (
+    models.Note.id,
+    models.Note.owner_id,
+    models.Note.title,
+    models.Note.content,
+    models.Note.created_at,
+    models.Note.version
+)
+NOTE_OUT_FIELDS = tuple(column.key for column in NOTE_OUT_COLUMNS)
+
+NOTE_LISTING_COLUMNS = {
+    column.key: column
+    for column in (
+        *NOTE_OUT_COLUMNS,
+        models.Note.updated_at,
+        func.substr(models.Note.content, 1, app_config.note_snippet_length).label("snippet")
+    )
+}
+NOTE_SUMMARY_FIELDS = ("id", "title", "updated_at", "snippet")
+
 async def create_note(
         note: crud_schemas.CreateNote,
         current_user: user_schemas.TokenData,
         db: AsyncSession
 )-> models.Note:
     
-    new_note = models.Note(
-        **note.model_dump(),
-        owner_id = current_user.id
-    )
+    new_note = (
+        await db.execute(
+            insert(models.Note)
+            .values(**note.model_dump(), owner_id = current_user.id)
+            .returning(models.Note)
+        )
+    ).scalar_one()
 
-    db.add(new_note)
     await db.commit()
-    await db.refresh(new_note)
 
     return new_note
 
@@ -35,7 +85,12 @@ async def read_note(
         id: int,
         current_user: user_schemas.TokenData,
         db: AsyncSession
-)-> models.Note:
+)-> Dict:
+
+   cached_note = await note_cache.get_note(current_user.id, id)
+
+   if cached_note:
+       return cached_note
 
    note = (
        await db.execute(
@@ -49,20 +104,138 @@ async def read_note(
            detail = "Note not found"
        )
 
+   note = note_payload(note)
+
+   if not db.info.get("replica"):
+       await note_cache.set_note(note)
+
    return note
 
-async def read_all_notes(
+async def read_note_version(
+        id: int,
         current_user: user_schemas.TokenData,
         db: AsyncSession
-)-> List[models.Note]:
-    
-    notes = (
+)-> Optional[Tuple[int, datetime]]:
+
+    cached_note = await note_cache.get_note(current_user.id, id)
+
+    if cached_note:
+        return cached_note["version"], cached_note["updated_at"]
+
+    return (
         await db.execute(
-            select(models.Note).where(models.Note.owner_id == current_user.id)
+            select(models.Note.version, models.Note.updated_at).where(models.Note.id == id, models.Note.owner_id == current_user.id)
         )
-    ).scalars().all()
+    ).one_or_none()
 
-    return notes
+def listing_fields(view: str, fields: Optional[str])-> Tuple[str, ...]:
+    if fields is None:
+        return NOTE_SUMMARY_FIELDS if view == "summary" else NOTE_OUT_FIELDS
+
+    if view == "summary":
+        raise HTTPException(
+            status_code = status.HTTP_400_BAD_REQUEST,
+            detail = "fields cannot be combined with view=summary"
+        )
+
+    requested = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in NOTE_LISTING_COLUMNS]
+
+    if not requested or unknown:
+        raise HTTPException(
+            status_code = status.HTTP_400_BAD_REQUEST,
+            detail = f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested"
+        )
+
+    return requested
+
+async def _read_owned_page(
+        columns: Tuple,
+        current_user: user_schemas.TokenData,
+        limit: int,
+        cursor: Optional[str],
+        db: AsyncSession
+)-> Tuple[List, Optional[str]]:
+
+    query = select(
+        *columns,
+        models.Note.updated_at.label("cursor_updated_at"),
+        models.Note.id.label("cursor_id")
+    ).where(models.Note.owner_id == current_user.id)
+
+    if cursor:
+        updated_at, id = pagination.decode_cursor(cursor)
+        query = query.where(
+            tuple_(models.Note.updated_at, models.Note.id)
+            < tuple_(pagination.position_bound(updated_at, db.bind.dialect.name), id)
+        )
+
+    rows = (
+        await db.execute(
+            query.order_by(models.Note.updated_at.desc(), models.Note.id.desc()).limit(limit + 1)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = pagination.encode_cursor(rows[-1].cursor_updated_at, rows[-1].cursor_id)
+
+    return rows, next_cursor
+
+async def read_all_notes_version(
+        current_user: user_schemas.TokenData,
+        limit: int,
+        cursor: Optional[str],
+        db: AsyncSession
+)-> Dict:
+
+    rows, next_cursor = await _read_owned_page((), current_user, limit, cursor, db)
+
+    return {
+        "next_cursor": next_cursor,
+        "version": [(row.cursor_id, row.cursor_updated_at) for row in rows]
+    }
+
+async def read_all_notes(
+        current_user: user_schemas.TokenData,
+        limit: int,
+        cursor: Optional[str],
+        db: AsyncSession,
+        fields: Tuple[str, ...] = NOTE_OUT_FIELDS
+)-> Dict:
+
+    rows, next_cursor = await _read_owned_page(
+        tuple(NOTE_LISTING_COLUMNS[field] for field in fields),
+        current_user,
+        limit,
+        cursor,
+        db
+    )
+
+    return {
+        "items": [dict(zip(fields, row)) for row in rows],
+        "next_cursor": next_cursor,
+        "version": [(row.cursor_id, row.cursor_updated_at) for row in rows]
+    }
+
+async def export_notes(
+        current_user: user_schemas.TokenData,
+        db: AsyncSession
+)-> AsyncIterator[bytes]:
+
+    notes = await db.stream(
+        select(*NOTE_OUT_COLUMNS)
+        .where(models.Note.owner_id == current_user.id)
+        .order_by(models.Note.id)
+        .execution_options(yield_per = app_config.export_fetch_batch_size)
+    )
+
+    async for batch in notes.partitions():
+        yield b"".join(
+            serialization.dumps(dict(zip(NOTE_OUT_FIELDS, row))) + b"\n"
+            for row in batch
+        )
 
 async def update_note(
         id: int,
@@ -71,27 +244,79 @@ async def update_note(
         db: AsyncSession
 )-> models.Note:
 
-    note_to_update = (
-        await db.execute(
-            select(models.Note).where(models.Note.id == id, models.Note.owner_id == current_user.id)
+    changes = _note_changes(note)
+
+    if changes:
+        query = (
+            update(models.Note)
+            .where(models.Note.id == id, models.Note.owner_id == current_user.id)
+            .values(**changes)
+            .returning(models.Note)
         )
-    ).scalar_one_or_none()
+    else:
+        query = select(models.Note).where(models.Note.id == id, models.Note.owner_id == current_user.id)
 
-    if not note_to_update:
+    updated_note = (await db.execute(query)).scalar_one_or_none()
+
+    if not updated_note:
         raise HTTPException(
             status_code = status.HTTP_404_NOT_FOUND,
             detail = "Note not found"
         )
 
-    if note.title:
-        note_to_update.title = note.title
-    if note.content:
-        note_to_update.content = note.content
+    await db.commit()
+
+    if changes:
+        await note_cache.invalidate_notes(current_user.id, {id: updated_note.version})
+
+    return updated_note
+
+async def patch_note(
+        id: int,
+        note: crud_schemas.PatchNote,
+        versions: Optional[List[int]],
+        current_user: user_schemas.TokenData,
+        db: AsyncSession
+)-> models.Note:
+
+    changes = note.model_dump(exclude_unset = True)
+    matched = [models.Note.id == id, models.Note.owner_id == current_user.id]
+
+    if versions is not None:
+        matched.append(models.Note.version.in_(versions))
+
+    if changes:
+        query = update(models.Note).where(*matched).values(**changes).returning(models.Note)
+    else:
+        query = select(models.Note).where(*matched)
+
+    patched_note = (await db.execute(query)).scalar_one_or_none()
+
+    if not patched_note:
+        version = (
+            await db.execute(
+                select(models.Note.version).where(models.Note.id == id, models.Note.owner_id == current_user.id)
+            )
+        ).scalar_one_or_none()
+
+        if version is None:
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "Note not found"
+            )
+
+        raise HTTPException(
+            status_code = status.HTTP_412_PRECONDITION_FAILED,
+            detail = "Note has been modified since it was read",
+            headers = {"ETag": conditional.note_etag(id, version)}
+        )
 
     await db.commit()
-    await db.refresh(note_to_update)
 
-    return note_to_update
+    if changes:
+        await note_cache.invalidate_notes(current_user.id, {id: patched_note.version})
+
+    return patched_note
 
 async def delete_note(
         id: int,
@@ -99,20 +324,159 @@ async def delete_note(
         db: AsyncSession
 )-> None:
     
-    note_to_delete = (
+    deleted_id = (
         await db.execute(
-            select(models.Note).where(models.Note.id == id, models.Note.owner_id == current_user.id)
+            delete(models.Note)
+            .where(models.Note.id == id, models.Note.owner_id == current_user.id)
+            .returning(models.Note.id)
         )
     ).scalar_one_or_none()
 
-    if not note_to_delete:
+    if not deleted_id:
         raise HTTPException(
             status_code = status.HTTP_404_NOT_FOUND,
             detail = "Note not found"
         )
     
-    await db.delete(note_to_delete)
     await db.commit()
+    await note_cache.invalidate_deleted_notes(current_user.id, [id])
+
+def _check_batch_size(size: int)-> None:
+    if size > app_config.max_batch_size:
+        raise HTTPException(
+            status_code = status.HTTP_413_CONTENT_TOO_LARGE,
+            detail = f"Batch size exceeds the maximum of {app_config.max_batch_size} items"
+        )
+
+def _note_changes(note: crud_schemas.UpdateNote)-> Dict:
+    changes = note.model_dump(include = {"title", "content"}, exclude_unset = True)
+
+    if changes.get("title") is None:
+        changes.pop("title", None)
+
+    return changes
+
+async def create_notes(
+        notes: List[crud_schemas.CreateNote],
+        current_user: user_schemas.TokenData,
+        db: AsyncSession
+)-> Dict:
+
+    _check_batch_size(len(notes))
+
+    if not notes:
+        return {"results": []}
+
+    new_notes = (
+        await db.execute(
+            insert(models.Note).returning(models.Note, sort_by_parameter_order = True),
+            [{**note.model_dump(), "owner_id": current_user.id} for note in notes]
+        )
+    ).scalars().all()
+
+    await db.commit()
+
+    return {
+        "results": [
+            {"index": index, "id": new_note.id, "status": "created", "note": new_note}
+            for index, new_note in enumerate(new_notes)
+        ]
+    }
+
+async def update_notes(
+        notes: List[crud_schemas.BatchUpdateNote],
+        current_user: user_schemas.TokenData,
+        db: AsyncSession
+)-> Dict:
+
+    _check_batch_size(len(notes))
+
+    if not notes:
+        return {"results": []}
+
+    changes = sorted(
+        (
+            {"id": note.id, **note_changes}
+            for note in notes
+            if (note_changes := _note_changes(note))
+        ),
+        key = lambda change: change["id"]
+    )
+
+    if changes:
+        await db.execute(
+            update(models.Note)
+            .where(models.Note.owner_id == current_user.id)
+            .execution_options(synchronize_session = None),
+            changes
+        )
+
+    updated_notes = {
+        updated_note.id: updated_note
+        for updated_note in (
+            await db.execute(
+                select(models.Note).where(
+                    models.Note.owner_id == current_user.id,
+                    models.Note.id.in_({note.id for note in notes})
+                )
+            )
+        ).scalars()
+    }
+
+    await db.commit()
+
+    changed_ids = {change["id"] for change in changes}
+    await note_cache.invalidate_notes(
+        current_user.id,
+        {id: updated_note.version for id, updated_note in updated_notes.items() if id in changed_ids}
+    )
+
+    return {
+        "results": [
+            {
+                "index": index,
+                "id": note.id,
+                "status": (
+                    "not_found" if note.id not in updated_notes
+                    else "updated" if note.id in changed_ids
+                    else "unchanged"
+                ),
+                "note": updated_notes.get(note.id)
+            }
+            for index, note in enumerate(notes)
+        ]
+    }
+
+async def delete_notes(
+        ids: List[int],
+        current_user: user_schemas.TokenData,
+        db: AsyncSession
+)-> Dict:
+
+    _check_batch_size(len(ids))
+
+    if not ids:
+        return {"results": []}
+
+    deleted_ids = set(
+        (
+            await db.execute(
+                delete(models.Note)
+                .where(models.Note.owner_id == current_user.id, models.Note.id.in_(set(ids)))
+                .returning(models.Note.id)
+            )
+        ).scalars()
+    )
+
+    await db.commit()
+    await note_cache.invalidate_deleted_notes(current_user.id, deleted_ids)
+
+    return {
+        "results": [
+            {"index": index, "id": id, "status": "deleted" if id in deleted_ids else "not_found"}
+            for index, id in enumerate(ids)
+        ]
+    }
 
 async def give_read_access(
         note_read_access: crud_schemas.CreateNoteReadAccess,
@@ -126,47 +490,53 @@ async def give_read_access(
             detail = "You cannot give read access to yourself"
         )
     
-    existing_user = (
-        await db.execute(
-            select(models.User).where(models.User.id == note_read_access.user_id)
-        )
-    ).scalar_one_or_none()
-
-    if not existing_user:
-        raise HTTPException(
-            status_code = status.HTTP_404_NOT_FOUND,
-            detail = "User does not exist"
-        )
-    
-    existing_note = (
+    new_note_read_access = (
         await db.execute(
-            select(models.Note).where(models.Note.id == note_read_access.note_id)
+            insert(models.NoteReadAccess)
+            .from_select(
+                ["user_id", "note_owner_id", "note_id"],
+                select(
+                    literal(note_read_access.user_id, Integer),
+                    literal(current_user.id, Integer),
+                    literal(note_read_access.note_id, Integer)
+                ).where(
+                    exists().where(models.User.id == note_read_access.user_id),
+                    exists().where(models.Note.id == note_read_access.note_id, models.Note.owner_id == current_user.id)
+                )
+            )
+            .on_conflict_do_nothing(index_elements = ["note_id", "user_id", "note_owner_id"])
+            .returning(models.NoteReadAccess)
         )
     ).scalar_one_or_none()
 
-    if not existing_note:
-        raise HTTPException(
-            status_code = status.HTTP_404_NOT_FOUND,
-            detail = "Note does not exist"
-    )
+    if not new_note_read_access:
+        user_exists, note_exists = (
+            await db.execute(
+                select(
+                    exists().where(models.User.id == note_read_access.user_id),
+                    exists().where(models.Note.id == note_read_access.note_id, models.Note.owner_id == current_user.id)
+                )
+            )
+        ).one()
+
+        if not user_exists:
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "User does not exist"
+            )
+
+        if not note_exists:
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "Note does not exist"
+            )
 
-    existing_note_read_access = (
-        await db.execute(
-            select(models.NoteReadAccess).where(models.NoteReadAccess.note_id == note_read_access.note_id, models.NoteReadAccess.user_id == note_read_access.user_id, models.NoteReadAccess.note_owner_id == current_user.id)
-        )
-    ).scalar_one_or_none()
-
-    if existing_note_read_access:
         raise HTTPException(
             status_code = status.HTTP_409_CONFLICT,
             detail = "User already has read access to this note"
         )
-    
-    new_note_read_access = models.NoteReadAccess(**note_read_access.model_dump(), note_owner_id = current_user.id)
 
-    db.add(new_note_read_access)
     await db.commit()
-    await db.refresh(new_note_read_access)
 
     return new_note_read_access
 
@@ -190,65 +560,131 @@ async def revoke_read_access(
     
     await db.delete(note_to_delete)
     await db.commit()
+    await note_cache.invalidate_grant(current_user.id, note_read_access.note_id, note_read_access.user_id)
 
 async def read_note_with_access(
         note: crud_schemas.ReadableNote,
         current_user: user_schemas.TokenData,
         db: AsyncSession
-)-> models.Note:
+)-> Dict:
     
     if note.user_id == current_user.id:
         raise HTTPException(
             status_code = status.HTTP_400_BAD_REQUEST,
             detail = "You already have access to your own note"
         )
+
+    cached_note = await note_cache.get_shared_note(note.user_id, note.note_id, current_user.id)
+
+    if cached_note:
+        return cached_note
     
-    existing_user = (
+    note_with_access = (
         await db.execute(
-            select(models.User).where(models.User.id == note.user_id)
+            select(models.Note)
+            .join(
+                models.NoteReadAccess,
+                and_(
+                    models.NoteReadAccess.note_id == models.Note.id,
+                    models.NoteReadAccess.note_owner_id == models.Note.owner_id,
+                    models.NoteReadAccess.user_id == current_user.id
+                )
+            )
+            .where(models.Note.id == note.note_id, models.Note.owner_id == note.user_id)
         )
     ).scalar_one_or_none()
 
-    if not existing_user:
+    if not note_with_access:
+        user_exists, note_exists, read_access_exists = (
+            await db.execute(
+                select(
+                    exists().where(models.User.id == note.user_id),
+                    exists().where(models.Note.id == note.note_id),
+                    exists().where(
+                        models.NoteReadAccess.note_id == note.note_id,
+                        models.NoteReadAccess.user_id == current_user.id,
+                        models.NoteReadAccess.note_owner_id == note.user_id
+                    )
+                )
+            )
+        ).one()
+
+        if not user_exists:
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "User does not exist"
+            )
+
+        if not note_exists:
+            raise HTTPException(
+                status_code = status.HTTP_404_NOT_FOUND,
+                detail = "Note does not exist"
+            )
+
+        if not read_access_exists:
+            raise HTTPException(
+                status_code = status.HTTP_403_FORBIDDEN,
+                detail = "You do not have read access to this note"
+            )
+
         raise HTTPException(
             status_code = status.HTTP_404_NOT_FOUND,
-            detail = "User does not exist"
-        )
-    
-    existing_note = (
-        await db.execute(
-            select(models.Note).where(models.Note.id == note.note_id)
+            detail = "Note not found"
         )
-    ).scalar_one_or_none()
 
-    if not existing_note:
-        raise HTTPException(
-            status_code = status.HTTP_404_NOT_FOUND,
-            detail = "Note does not exist"
-    )
+    note_with_access = note_payload(note_with_access)
 
-    note_read_access = (
-        await db.execute(
-            select(models.NoteReadAccess).where(models.NoteReadAccess.note_id == note.note_id, models.NoteReadAccess.user_id == current_user.id, models.NoteReadAccess.note_owner_id == note.user_id)
-        )
-    ).scalar_one_or_none()
+    if not db.info.get("replica"):
+        await note_cache.set_grant(note.user_id, note.note_id, current_user.id)
+        await note_cache.set_note(note_with_access)
 
-    if not note_read_access:
-        raise HTTPException(
-            status_code = status.HTTP_403_FORBIDDEN,
-            detail = "You do not have read access to this note"
-        )
+    return note_with_access
 
-    note_with_access = (
-        await db.execute(
-            select(models.Note).where(models.Note.id == note.note_id, models.Note.owner_id == note.user_id)
+async def read_shared_notes(
+        current_user: user_schemas.TokenData,
+        limit: int,
+        cursor: Optional[str],
+        db: AsyncSession
+)-> Dict:
+
+    query = (
+        select(
+            *NOTE_OUT_COLUMNS,
+            models.NoteReadAccess.granted_at,
+            models.NoteReadAccess.id.label("grant_id")
         )
-    ).scalar_one_or_none()
+        .join(
+            models.Note,
+            and_(
+                models.Note.id == models.NoteReadAccess.note_id,
+                models.Note.owner_id == models.NoteReadAccess.note_owner_id
+            )
+        )
+        .where(models.NoteReadAccess.user_id == current_user.id)
+    )
 
-    if not note_with_access:
-        raise HTTPException(
-            status_code = status.HTTP_404_NOT_FOUND,
-            detail = "Note not found"
+    if cursor:
+        granted_at, grant_id = pagination.decode_cursor(cursor)
+        query = query.where(
+            tuple_(models.NoteReadAccess.granted_at, models.NoteReadAccess.id)
+            < tuple_(pagination.position_bound(granted_at, db.bind.dialect.name), grant_id)
         )
 
-    return note_with_access
\ No newline at end of file
+    rows = (
+        await db.execute(
+            query.order_by(models.NoteReadAccess.granted_at.desc(), models.NoteReadAccess.id.desc()).limit(limit + 1)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = pagination.encode_cursor(rows[-1].granted_at, rows[-1].grant_id)
+
+    return {
+        "items": [
+            {**dict(zip(NOTE_OUT_FIELDS, row)), "granted_at": row.granted_at}
+            for row in rows
+        ],
+        "next_cursor": next_cursor
+    }
\ No newline at end of file
@@ -0,0 +1,145 @@
+import json
+
+from typing import (
+    Dict,
+    Iterable,
+    Optional
+)
+
+from datetime import datetime
+
+from app.database import models
+from app.core.config import app_config
+from app.utils.cache import (
+    MAX_RANK,
+    create_cache_backend,
+    unpack_ranked
+)
+
+NOTE_FIELDS = ("id", "owner_id", "title", "content", "created_at", "updated_at", "version")
+DATETIME_FIELDS = ("created_at", "updated_at")
+
+def note_payload(note: models.Note)-> Dict:
+    return {field: getattr(note, field) for field in NOTE_FIELDS}
+
+def _note_key(owner_id: int, note_id: int)-> str:
+    return f"note:{owner_id}:{note_id}"
+
+def _grant_key(owner_id: int, note_id: int, user_id: int)-> str:
+    return f"grant:{owner_id}:{note_id}:{user_id}"
+
+def _owner_key(owner_id: int)-> str:
+    return f"owner:{owner_id}"
+
+def _encode(note: Dict)-> bytes:
+    return json.dumps(
+        {
+            field: value.isoformat() if isinstance(value, datetime) else value
+            for field, value in note.items()
+        },
+        separators = (",", ":")
+    ).encode("utf-8")
+
+def _decode(raw: bytes)-> Optional[Dict]:
+    rank, value = unpack_ranked(raw)
+
+    if rank is None or not value:
+        return None
+
+    note = json.loads(value)
+
+    for field in DATETIME_FIELDS:
+        if note.get(field) is not None:
+            note[field] = datetime.fromisoformat(note[field])
+
+    return note
+
+def _is_current(note: Dict)-> bool:
+    return all(field in note for field in NOTE_FIELDS)
+
+class NoteCache:
+    def __init__(self, backend, ttl_seconds: float)-> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    async def get_note(self, owner_id: int, note_id: int)-> Optional[Dict]:
+        (raw,) = await self.backend.get_many([_note_key(owner_id, note_id)])
+        note = _decode(raw) if raw is not None else None
+
+        if note is None or not _is_current(note):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return note
+
+    async def get_shared_note(self, owner_id: int, note_id: int, user_id: int)-> Optional[Dict]:
+        grant, raw = await self.backend.get_many([
+            _grant_key(owner_id, note_id, user_id),
+            _note_key(owner_id, note_id)
+        ])
+
+        granted = grant is not None and unpack_ranked(grant) == (0, b"1")
+        note = _decode(raw) if granted and raw is not None else None
+
+        if note is None or not _is_current(note):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return note
+
+    async def set_note(self, note: Dict)-> None:
+        await self.backend.set_if_newer(
+            _note_key(note["owner_id"], note["id"]),
+            _encode(note),
+            2 * note["version"],
+            self.ttl_seconds,
+            guard = _owner_key(note["owner_id"])
+        )
+
+    async def set_grant(self, owner_id: int, note_id: int, user_id: int)-> None:
+        await self.backend.set_if_newer(
+            _grant_key(owner_id, note_id, user_id),
+            b"1",
+            0,
+            self.ttl_seconds,
+            guard = _owner_key(owner_id)
+        )
+
+    async def invalidate_notes(self, owner_id: int, versions: Dict[int, int])-> None:
+        for note_id, version in versions.items():
+            await self.backend.set_if_newer(_note_key(owner_id, note_id), b"", 2 * version - 1, self.ttl_seconds)
+
+    async def invalidate_deleted_notes(self, owner_id: int, note_ids: Iterable[int])-> None:
+        for note_id in note_ids:
+            await self.backend.set_if_newer(_note_key(owner_id, note_id), b"", MAX_RANK, self.ttl_seconds)
+
+    async def invalidate_grant(self, owner_id: int, note_id: int, user_id: int)-> None:
+        await self.backend.set_if_newer(_grant_key(owner_id, note_id, user_id), b"", MAX_RANK, self.ttl_seconds)
+
+    async def invalidate_owner(self, owner_id: int)-> None:
+        await self.backend.set(_owner_key(owner_id), b"1", self.ttl_seconds)
+        await self.backend.delete_prefix(f"note:{owner_id}:")
+        await self.backend.delete_prefix(f"grant:{owner_id}:")
+
+    def snapshot(self)-> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            **{
+                f"backend_{name}": value
+                for name, value in self.backend.snapshot().items()
+            }
+        }
+
+note_cache = NoteCache(
+    backend = create_cache_backend(
+        app_config.note_cache_url,
+        max_size = app_config.note_cache_max_size,
+        ttl_seconds = app_config.note_cache_ttl_seconds
+    ),
+    ttl_seconds = app_config.note_cache_ttl_seconds
+)
\ No newline at end of file
@@ -0,0 +1,97 @@
+from typing import Dict
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    column,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+    table
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import models
+from app.schemas import user_schemas
+
+notes_fts = table("notes_fts", column("rowid"))
+
+def _visible_to(current_user: user_schemas.TokenData)-> ColumnElement[bool]:
+    return or_(
+        models.Note.owner_id == current_user.id,
+        exists().where(
+            models.NoteReadAccess.note_id == models.Note.id,
+            models.NoteReadAccess.note_owner_id == models.Note.owner_id,
+            models.NoteReadAccess.user_id == current_user.id
+        )
+    )
+
+def _note_columns()-> tuple:
+    return (
+        models.Note.id,
+        models.Note.owner_id,
+        models.Note.title,
+        models.Note.content,
+        models.Note.created_at,
+        models.Note.version
+    )
+
+def _postgres_query(query: str)-> Select:
+    ts_query = func.websearch_to_tsquery("english", query)
+    search_vector = literal_column("notes.search_vector")
+    rank = func.ts_rank_cd(search_vector, ts_query).label("rank")
+
+    return (
+        select(*_note_columns(), rank)
+        .where(search_vector.bool_op("@@")(ts_query))
+        .order_by(rank.desc(), models.Note.id.desc())
+    )
+
+def _sqlite_query(query: str)-> Select:
+    terms = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+    rank = (-func.bm25(literal_column("notes_fts"))).label("rank")
+
+    return (
+        select(*_note_columns(), rank)
+        .select_from(models.Note)
+        .join(notes_fts, notes_fts.c.rowid == models.Note.id)
+        .where(literal_column("notes_fts").op("MATCH")(terms))
+        .order_by(rank.desc(), models.Note.id.desc())
+    )
+
+async def search_notes(
+        query: str,
+        current_user: user_schemas.TokenData,
+        limit: int,
+        offset: int,
+        db: AsyncSession
+)-> Dict:
+
+    if not query.split():
+        return {
+            "items": [],
+            "next_offset": None
+        }
+
+    if db.bind.dialect.name == "sqlite":
+        statement = _sqlite_query(query)
+    else:
+        statement = _postgres_query(query)
+
+    rows = (
+        await db.execute(
+            statement.where(_visible_to(current_user)).limit(limit + 1).offset(offset)
+        )
+    ).all()
+
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+
+    return {
+        "items": [row._asdict() for row in rows],
+        "next_offset": next_offset
+    }
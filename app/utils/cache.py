@@ -0,0 +1,390 @@
+import time
+import asyncio
+import logging
+
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+from collections import OrderedDict
+from urllib.parse import (
+    unquote,
+    urlparse
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_RANK = 2 ** 53 - 1
+
+SET_IF_NEWER_SCRIPT = """
+if KEYS[2] and redis.call("EXISTS", KEYS[2]) == 1 then
+    return 0
+end
+local current = redis.call("GET", KEYS[1])
+if current then
+    local rank = tonumber(string.match(current, "^(%d+)\\n"))
+    if rank and rank >= tonumber(ARGV[2]) then
+        return 0
+    end
+end
+redis.call("SET", KEYS[1], ARGV[1], "PX", ARGV[3])
+return 1
+"""
+
+def pack_ranked(rank: int, value: bytes)-> bytes:
+    return str(rank).encode("ascii") + b"\n" + value
+
+def unpack_ranked(raw: bytes)-> Tuple[Optional[int], bytes]:
+    head, separator, value = raw.partition(b"\n")
+
+    if not separator or not head.isdigit():
+        return None, raw
+
+    return int(head), value
+
+class TTLCache:
+    def __init__(self, max_size: int, ttl_seconds: float)-> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None)-> Any:
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None)-> None:
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last = False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable)-> None:
+        self._data.pop(key, None)
+
+    def clear(self)-> None:
+        self._data.clear()
+
+    def keys(self)-> List[Hashable]:
+        return list(self._data)
+
+    def __len__(self)-> int:
+        return len(self._data)
+
+    def snapshot(self)-> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+class NullCacheBackend:
+    async def get_many(self, keys: Sequence[str])-> List[Optional[bytes]]:
+        return [None] * len(keys)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float)-> None:
+        return None
+
+    async def set_if_newer(
+            self,
+            key: str,
+            value: bytes,
+            rank: int,
+            ttl_seconds: float,
+            guard: Optional[str] = None
+    )-> bool:
+        return False
+
+    async def delete(self, *keys: str)-> None:
+        return None
+
+    async def delete_prefix(self, prefix: str)-> None:
+        return None
+
+    async def close(self)-> None:
+        return None
+
+    def snapshot(self)-> Dict[str, int]:
+        return {}
+
+class MemoryCacheBackend:
+    def __init__(self, max_size: int, ttl_seconds: float)-> None:
+        self._cache = TTLCache(max_size = max_size, ttl_seconds = ttl_seconds)
+
+    async def get_many(self, keys: Sequence[str])-> List[Optional[bytes]]:
+        return [self._cache.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float)-> None:
+        self._cache.set(key, value, ttl_seconds = ttl_seconds)
+
+    async def set_if_newer(
+            self,
+            key: str,
+            value: bytes,
+            rank: int,
+            ttl_seconds: float,
+            guard: Optional[str] = None
+    )-> bool:
+        if guard is not None and self._cache.get(guard) is not None:
+            return False
+
+        current = self._cache.get(key)
+
+        if current is not None:
+            current_rank, _ = unpack_ranked(current)
+            if current_rank is not None and current_rank >= rank:
+                return False
+
+        self._cache.set(key, pack_ranked(rank, value), ttl_seconds = ttl_seconds)
+        return True
+
+    async def delete(self, *keys: str)-> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    async def delete_prefix(self, prefix: str)-> None:
+        for key in [key for key in self._cache.keys() if key.startswith(prefix)]:
+            self._cache.delete(key)
+
+    async def close(self)-> None:
+        self._cache.clear()
+
+    def snapshot(self)-> Dict[str, int]:
+        return self._cache.snapshot()
+
+class RedisError(Exception):
+    pass
+
+class RedisConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter)-> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def _read_reply(self)-> Any:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+
+        prefix, payload = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return payload.decode("utf-8")
+        if prefix == b"-":
+            raise RedisError(payload.decode("utf-8"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+
+        raise RedisError(f"Unexpected reply from cache server: {line!r}")
+
+    async def command(self, *args: Any)-> Any:
+        encoded = [arg if isinstance(arg, bytes) else str(arg).encode("utf-8") for arg in args]
+        request = b"".join(
+            [f"*{len(encoded)}\r\n".encode("ascii")]
+            + [f"${len(arg)}\r\n".encode("ascii") + arg + b"\r\n" for arg in encoded]
+        )
+
+        self.writer.write(request)
+        await self.writer.drain()
+
+        return await self._read_reply()
+
+    def close(self)-> None:
+        self.writer.close()
+
+class RedisCacheBackend:
+    def __init__(
+            self,
+            url: str,
+            timeout_seconds: float = 0.5,
+            max_connections: int = 8,
+            failure_threshold: int = 3,
+            cooldown_seconds: float = 5.0
+    )-> None:
+        parsed = urlparse(url)
+
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout_seconds = timeout_seconds
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.errors = 0
+        self.skipped = 0
+
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: List[RedisConnection] = []
+        self._failures = 0
+        self._suspended_until = 0.0
+
+    async def _connect(self)-> RedisConnection:
+        connection = RedisConnection(*await asyncio.open_connection(self.host, self.port))
+
+        try:
+            if self.password:
+                await connection.command("AUTH", self.password)
+            if self.db:
+                await connection.command("SELECT", str(self.db))
+        except BaseException:
+            connection.close()
+            raise
+
+        return connection
+
+    async def execute(self, *args: Any)-> Any:
+        async with asyncio.timeout(self.timeout_seconds):
+            async with self._slots:
+                connection = self._idle.pop() if self._idle else await self._connect()
+
+                try:
+                    reply = await connection.command(*args)
+                except BaseException:
+                    connection.close()
+                    raise
+
+                self._idle.append(connection)
+                return reply
+
+    async def _safe_execute(self, *args: Any)-> Any:
+        if time.monotonic() < self._suspended_until:
+            self.skipped += 1
+            return None
+
+        try:
+            reply = await self.execute(*args)
+        except (OSError, EOFError, TimeoutError, asyncio.IncompleteReadError, RedisError) as exc:
+            self.errors += 1
+            self._failures += 1
+            logger.warning("Cache command %s failed: %s", args[0], exc)
+
+            if self._failures >= self.failure_threshold and time.monotonic() >= self._suspended_until:
+                self._suspended_until = time.monotonic() + self.cooldown_seconds
+                self._failures = 0
+                logger.warning("Skipping the cache for %s seconds after repeated failures", self.cooldown_seconds)
+            return None
+
+        self._failures = 0
+        return reply
+
+    async def get_many(self, keys: Sequence[str])-> List[Optional[bytes]]:
+        values = await self._safe_execute("MGET", *keys)
+
+        return values if values is not None else [None] * len(keys)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float)-> None:
+        await self._safe_execute("SET", key, value, "PX", max(1, int(ttl_seconds * 1000)))
+
+    async def set_if_newer(
+            self,
+            key: str,
+            value: bytes,
+            rank: int,
+            ttl_seconds: float,
+            guard: Optional[str] = None
+    )-> bool:
+        keys = [key] if guard is None else [key, guard]
+        stored = await self._safe_execute(
+            "EVAL",
+            SET_IF_NEWER_SCRIPT,
+            len(keys),
+            *keys,
+            pack_ranked(rank, value),
+            rank,
+            max(1, int(ttl_seconds * 1000))
+        )
+
+        return stored == 1
+
+    async def delete(self, *keys: str)-> None:
+        if keys:
+            await self._safe_execute("DEL", *keys)
+
+    async def delete_prefix(self, prefix: str)-> None:
+        cursor = "0"
+
+        while True:
+            reply = await self._safe_execute("SCAN", cursor, "MATCH", f"{prefix}*", "COUNT", 500)
+            if reply is None:
+                return
+
+            cursor, keys = reply[0].decode("ascii"), reply[1]
+            if keys:
+                await self._safe_execute("DEL", *keys)
+            if cursor == "0":
+                return
+
+    async def close(self)-> None:
+        while self._idle:
+            self._idle.pop().close()
+
+    def snapshot(self)-> Dict[str, int]:
+        return {
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "idle_connections": len(self._idle)
+        }
+
+SHARED_SCHEMES = ("redis", "valkey")
+
+def is_shared_cache(url: Optional[str])-> bool:
+    return urlparse(url or "").scheme in SHARED_SCHEMES
+
+def create_cache_backend(
+        url: Optional[str],
+        max_size: int,
+        ttl_seconds: float
+):
+    if not url:
+        return NullCacheBackend()
+
+    scheme = urlparse(url).scheme
+
+    if scheme == "memory":
+        return MemoryCacheBackend(max_size = max_size, ttl_seconds = ttl_seconds)
+    if scheme in SHARED_SCHEMES:
+        return RedisCacheBackend(url)
+
+    raise ValueError(f"Unsupported cache backend: {url}")
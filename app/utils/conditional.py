@@ -0,0 +1,113 @@
+import re
+import hashlib
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from datetime import (
+    datetime,
+    timezone
+)
+from email.utils import (
+    format_datetime,
+    parsedate_to_datetime
+)
+
+from fastapi import (
+    Request,
+    Response,
+    status
+)
+
+NOTE_ETAG = re.compile(r'"note-(?P<id>\d+)-(?P<version>\d+)"')
+
+def _as_utc(value: datetime)-> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo = timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+def make_etag(*parts: object)-> str:
+    digest = hashlib.sha256(
+        "|".join("" if part is None else str(part) for part in parts).encode("utf-8")
+    ).hexdigest()
+
+    return f'"{digest[:32]}"'
+
+def note_etag(id: int, version: int)-> str:
+    return f'"note-{id}-{version}"'
+
+def listing_etag(
+        user_id: int,
+        limit: int,
+        cursor: Optional[str],
+        fields: Tuple[str, ...],
+        page: Dict[str, Any]
+)-> str:
+    return make_etag("notes", user_id, limit, cursor, page["next_cursor"], *fields, *page["version"])
+
+def matched_versions(request: Request, id: int)-> Optional[List[int]]:
+    if_match = request.headers.get("if-match")
+
+    if if_match is None:
+        return None
+
+    versions = []
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return None
+
+        match = NOTE_ETAG.fullmatch(candidate)
+        if match and int(match["id"]) == id:
+            versions.append(int(match["version"]))
+
+    return versions
+
+def has_preconditions(request: Request)-> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+def is_not_modified(
+        request: Request,
+        etag: str,
+        last_modified: Optional[datetime]
+)-> bool:
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is not None:
+        candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        return _as_utc(last_modified).replace(microsecond = 0) <= _as_utc(since)
+
+    return False
+
+def set_validators(
+        response: Response,
+        etag: str,
+        last_modified: Optional[datetime]
+)-> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt = True)
+
+def not_modified(etag: str, last_modified: Optional[datetime])-> Response:
+    response = Response(status_code = status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+
+    return response
@@ -1,15 +1,21 @@
+import logging
+
 from fastapi import (
     FastAPI,
     Request
 )
 from fastapi.responses import JSONResponse
 
+logger = logging.getLogger(__name__)
+
 def register_exception_handler(app: FastAPI)-> None:
     @app.exception_handler(Exception)
     async def http_exception_handler(request: Request, exc: Exception)-> None:
+        logger.error("Unhandled error on %s %s", request.method, request.url.path, exc_info = exc)
+
         return JSONResponse(
             status_code = 500,
             content = {
-                "detail": str(exc)
+                "detail": "Internal server error"
             }
         )
\ No newline at end of file
@@ -0,0 +1,224 @@
+import time
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+from bisect import bisect_left
+from collections import defaultdict
+
+from starlette.routing import Match
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PASSWORD_HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = REQUEST_BUCKETS)-> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float)-> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class HttpMetrics:
+    def __init__(self)-> None:
+        self.durations: Dict[Tuple[str, str, str], Histogram] = {}
+        self.in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float)-> None:
+        key = (method, route, str(status_code))
+        histogram = self.durations.get(key)
+
+        if histogram is None:
+            histogram = self.durations[key] = Histogram()
+
+        histogram.observe(seconds)
+
+http_metrics = HttpMetrics()
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, routes: List[Any], metrics: HttpMetrics = http_metrics)-> None:
+        self.app = app
+        self.routes = routes
+        self.metrics = metrics
+        self._static_routes: Dict[Tuple[str, str], str] = {}
+
+    def _route_path(self, scope: Scope)-> str:
+        key = (scope["method"], scope["path"])
+        route = self._static_routes.get(key)
+
+        if route is None:
+            route, full = self._match_route(scope)
+            if full and route == scope["path"] and scope["method"] in HTTP_METHODS:
+                self._static_routes[key] = route
+
+        return route
+
+    def _match_route(self, scope: Scope)-> Tuple[str, bool]:
+        partial = None
+
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path, True
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+
+        return partial or "unmatched", False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send)-> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in HTTP_METHODS else "other"
+        key = (method, self._route_path(scope))
+        status_code = 500
+
+        async def send_with_status(message: Dict[str, Any])-> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.in_flight[key] += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight[key] -= 1
+            self.metrics.observe(*key, status_code, time.perf_counter() - started)
+
+def _escape(value: str)-> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: Dict[str, str])-> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+class MetricsWriter:
+    def __init__(self, prefix: str = "notes_api_")-> None:
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help: str)-> str:
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+        return name
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, str]] = None)-> None:
+        value = value if isinstance(value, int) else float(value)
+        self.lines.append(f"{name}{_labels(labels or {})} {value!r}")
+
+    def histogram(self, name: str, histogram: Histogram, labels: Optional[Dict[str, str]] = None)-> None:
+        labels = labels or {}
+        cumulative = 0
+
+        for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            self.sample(f"{name}_bucket", cumulative, {**labels, "le": le})
+
+        self.sample(f"{name}_sum", histogram.sum, labels)
+        self.sample(f"{name}_count", histogram.count, labels)
+
+    def render(self)-> str:
+        return "\n".join(self.lines) + "\n"
+
+def render_metrics(
+        http: HttpMetrics,
+        pools: Dict[str, Tuple[Dict[str, float], Any]],
+        hashing_metrics: Any,
+        admission_limiters: Dict[str, Any],
+        rate_limiters: Dict[str, Any]
+)-> str:
+    writer = MetricsWriter()
+
+    name = writer.family("http_request_duration_seconds", "histogram", "HTTP request latency by route template.")
+    for (method, route, status_code), histogram in sorted(http.durations.items()):
+        writer.histogram(name, histogram, {"method": method, "route": route, "status": status_code})
+
+    name = writer.family("http_requests_in_flight", "gauge", "HTTP requests currently being served.")
+    for (method, route), count in sorted(http.in_flight.items()):
+        writer.sample(name, count, {"method": method, "route": route})
+
+    name = writer.family("db_pool_size", "gauge", "Configured size of the database connection pool.")
+    for pool_name, (pool, _) in pools.items():
+        writer.sample(name, pool["size"], {"pool": pool_name})
+
+    name = writer.family("db_pool_connections", "gauge", "Database connections by pool state.")
+    for pool_name, (pool, _) in pools.items():
+        for state in ("checked_out", "checked_in", "overflow"):
+            writer.sample(name, max(pool[state], 0), {"pool": pool_name, "state": state})
+
+    instrumented = {pool_name: pool_metrics for pool_name, (_, pool_metrics) in pools.items() if pool_metrics is not None}
+
+    if instrumented:
+        name = writer.family("db_pool_waiting", "gauge", "Coroutines waiting for a pooled connection.")
+        for pool_name, pool_metrics in instrumented.items():
+            writer.sample(name, pool_metrics.waiting, {"pool": pool_name})
+
+        name = writer.family("db_pool_timeouts_total", "counter", "Connection checkouts that timed out.")
+        for pool_name, pool_metrics in instrumented.items():
+            writer.sample(name, pool_metrics.timeouts, {"pool": pool_name})
+
+        name = writer.family("db_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a pooled connection.")
+        for pool_name, pool_metrics in instrumented.items():
+            writer.histogram(name, pool_metrics.checkout_wait, {"pool": pool_name})
+
+    name = writer.family("password_hash_duration_seconds", "histogram", "bcrypt hash and verify time on the worker pool.")
+    for operation, histogram in sorted(hashing_metrics.durations.items()):
+        writer.histogram(name, histogram, {"operation": operation})
+
+    name = writer.family("password_hash_queue_wait_seconds", "histogram", "Time bcrypt jobs waited for a worker.")
+    for operation, histogram in sorted(hashing_metrics.waits.items()):
+        writer.histogram(name, histogram, {"operation": operation})
+
+    name = writer.family("password_hash_in_flight", "gauge", "bcrypt jobs queued or running.")
+    writer.sample(name, hashing_metrics.in_flight)
+
+    name = writer.family("password_hash_rejected_total", "counter", "bcrypt jobs rejected because the queue was full.")
+    writer.sample(name, hashing_metrics.rejected)
+
+    name = writer.family("admission_active", "gauge", "Requests holding an admission slot.")
+    for endpoint, limiter in sorted(admission_limiters.items()):
+        writer.sample(name, limiter.active, {"endpoint": endpoint})
+
+    name = writer.family("admission_waiting", "gauge", "Requests queued for an admission slot.")
+    for endpoint, limiter in sorted(admission_limiters.items()):
+        writer.sample(name, limiter.waiting, {"endpoint": endpoint})
+
+    name = writer.family("admission_rejected_total", "counter", "Requests shed by admission control.")
+    for endpoint, limiter in sorted(admission_limiters.items()):
+        writer.sample(name, limiter.rejected, {"endpoint": endpoint, "reason": "queue_full"})
+        writer.sample(name, limiter.timeouts, {"endpoint": endpoint, "reason": "queue_timeout"})
+
+    name = writer.family("rate_limited_total", "counter", "Requests rejected by a token bucket.")
+    for scope, limiter in sorted(rate_limiters.items()):
+        if limiter is not None:
+            writer.sample(name, limiter.rejected, {"scope": scope})
+
+    return writer.render()
@@ -0,0 +1,50 @@
+import json
+import base64
+import binascii
+
+from typing import (
+    Any,
+    Tuple
+)
+
+from datetime import (
+    datetime,
+    timezone
+)
+
+from fastapi import (
+    HTTPException,
+    status
+)
+
+from sqlalchemy import (
+    String,
+    literal
+)
+
+def encode_cursor(position: datetime, id: int)-> str:
+    raw = json.dumps([position.isoformat(), id], separators = (",", ":"))
+
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str)-> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+        return datetime.fromisoformat(position), int(id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code = status.HTTP_400_BAD_REQUEST,
+            detail = "Invalid cursor"
+        )
+
+def position_bound(position: datetime, dialect_name: str)-> Any:
+    if dialect_name != "sqlite":
+        return position
+
+    if position.tzinfo is not None:
+        position = position.astimezone(timezone.utc)
+
+    stored_format = "%Y-%m-%d %H:%M:%S.%f" if position.microsecond else "%Y-%m-%d %H:%M:%S"
+    return literal(position.strftime(stored_format), String)
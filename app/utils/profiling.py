@@ -0,0 +1,138 @@
+import time
+import random
+import logging
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send
+)
+
+logger = logging.getLogger(__name__)
+
+class RequestProfile:
+    def __init__(self)-> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slow_statements: List[Tuple[float, str, Any]] = []
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default = None)
+
+def install_query_profiler(engine: AsyncEngine, slow_statement_seconds: float)-> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany)-> None:
+        if current_profile.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany)-> None:
+        profile = current_profile.get()
+        started = conn.info.get("profile_started")
+        if profile is None or not started:
+            return
+
+        seconds = time.perf_counter() - started.pop()
+        profile.queries += 1
+        profile.db_seconds += seconds
+
+        if seconds >= slow_statement_seconds and not executemany:
+            profile.slow_statements.append((seconds, statement, parameters))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context)-> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profile_started"):
+            connection.info["profile_started"].pop()
+
+def server_timing(profile: RequestProfile, total_seconds: float)-> str:
+    return (
+        f'db;desc="{profile.queries} queries";dur={profile.db_seconds * 1000:.2f}, '
+        f"total;dur={total_seconds * 1000:.2f}"
+    )
+
+class ProfilingMiddleware:
+    def __init__(
+            self,
+            app: ASGIApp,
+            engine: AsyncEngine,
+            slow_request_queries: int,
+            slow_request_ms: float,
+            explain_sample_rate: float
+    )-> None:
+        self.app = app
+        self.engine = engine
+        self.slow_request_queries = slow_request_queries
+        self.slow_request_seconds = slow_request_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send)-> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Dict[str, Any])-> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(profile, time.perf_counter() - started).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(token)
+
+        elapsed = time.perf_counter() - started
+        if profile.queries > self.slow_request_queries or elapsed > self.slow_request_seconds:
+            logger.warning(
+                "Slow request %s %s: %d queries, %.1f ms in database, %.1f ms total",
+                scope["method"],
+                scope["path"],
+                profile.queries,
+                profile.db_seconds * 1000,
+                elapsed * 1000
+            )
+
+        if profile.slow_statements and random.random() < self.explain_sample_rate:
+            await self._explain(max(profile.slow_statements, key = lambda entry: entry[0]))
+
+    async def _explain(self, slow_statement: Tuple[float, str, Any])-> None:
+        seconds, statement, parameters = slow_statement
+
+        if self.engine.dialect.name != "postgresql" or not statement.lstrip().upper().startswith("SELECT"):
+            return
+
+        try:
+            async with self.engine.connect() as conn:
+                plan = (
+                    await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                ).scalars().all()
+        except Exception as exc:
+            logger.warning("EXPLAIN ANALYZE failed for slow statement: %s", exc)
+            return
+
+        logger.warning(
+            "Slow statement (%.1f ms):\n%s\n%s",
+            seconds * 1000,
+            statement,
+            "\n".join(plan)
+        )
@@ -1,4 +1,7 @@
-from typing import Optional
+from typing import (
+    List,
+    Optional
+)
 
 from datetime import datetime
 
@@ -26,6 +29,7 @@ class Note(BaseModel):
     title: str
     content: Optional[str] = Field(default = None)
     created_at: datetime
+    version: int
 
     class Config:
         from_attributes = True
@@ -37,9 +41,46 @@ class NoteCreated(Note):
 class NoteOut(Note):
     pass
 
+class NotePage(BaseModel):
+    items: List[NoteOut]
+    next_cursor: Optional[str] = Field(default = None)
+
+class NoteSummary(BaseModel):
+    id: int
+    title: str
+    updated_at: datetime
+    snippet: Optional[str] = Field(default = None)
+
+class NoteSummaryPage(BaseModel):
+    items: List[NoteSummary]
+    next_cursor: Optional[str] = Field(default = None)
+
+class NoteProjection(BaseModel):
+    id: Optional[int] = Field(default = None)
+    owner_id: Optional[int] = Field(default = None)
+    title: Optional[str] = Field(default = None)
+    content: Optional[str] = Field(default = None)
+    created_at: Optional[datetime] = Field(default = None)
+    updated_at: Optional[datetime] = Field(default = None)
+    version: Optional[int] = Field(default = None)
+    snippet: Optional[str] = Field(default = None)
+
+class NoteProjectionPage(BaseModel):
+    items: List[NoteProjection]
+    next_cursor: Optional[str] = Field(default = None)
+
 class NoteUpdated(Note):
     updated_at: datetime
 
+class BatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = Field(default = None)
+    status: str
+    note: Optional[NoteUpdated] = Field(default = None)
+
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]
+
 class NoteReadAccess(BaseModel):
     user_id: int
     note_owner_id: int
@@ -50,4 +91,18 @@ class NoteReadAccess(BaseModel):
         from_attributes = True
 
 class NoteWithReadAccess(Note):
-    pass
\ No newline at end of file
+    pass
+
+class SharedNote(Note):
+    granted_at: datetime
+
+class NoteSearchHit(Note):
+    rank: float
+
+class NoteSearchPage(BaseModel):
+    items: List[NoteSearchHit]
+    next_offset: Optional[int] = Field(default = None)
+
+class SharedNotePage(BaseModel):
+    items: List[SharedNote]
+    next_cursor: Optional[str] = Field(default = None)
\ No newline at end of file
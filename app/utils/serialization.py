@@ -0,0 +1,14 @@
+from typing import Any
+
+import orjson
+
+from fastapi.responses import Response
+
+def dumps(content: Any)-> bytes:
+    return orjson.dumps(content, option = orjson.OPT_UTC_Z)
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any)-> bytes:
+        return dumps(content)
\ No newline at end of file
@@ -1,7 +1,14 @@
+import asyncio
 import hashlib
 
+from contextlib import AsyncExitStack
+
 import bcrypt
 
+from sqlalchemy import (
+    exc,
+    text
+)
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.database.models import Base
@@ -10,6 +17,35 @@ async def init_db(engine: AsyncEngine)-> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+async def ping_db(engine: AsyncEngine)-> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def wait_for_db(
+        engine: AsyncEngine,
+        retries: int,
+        backoff_seconds: float,
+        backoff_max_seconds: float
+)-> None:
+    delay = backoff_seconds
+
+    for attempt in range(1, retries + 1):
+        try:
+            await ping_db(engine)
+            return
+        except (OSError, exc.DBAPIError):
+            if attempt == retries:
+                raise
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, backoff_max_seconds)
+
+async def warm_pool(engine: AsyncEngine, connections: int)-> None:
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+
 def hash_password(password: str)-> str:
     sha = hashlib.sha256(password.encode("utf-8")).digest()
     hashed = bcrypt.hashpw(sha, bcrypt.gensalt()).decode("utf-8")
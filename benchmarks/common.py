@@ -0,0 +1,81 @@
+import os
+import time
+import tempfile
+
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Tuple
+)
+
+for name, value in {
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "JWT_SECRET_KEY": "bench-secret"
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi import HTTPException
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine
+)
+
+from app.database.models import Base
+
+def default_database_url()-> str:
+    path = os.path.join(tempfile.gettempdir(), "notes-api-bench.sqlite3")
+
+    return f"sqlite+aiosqlite:///{path}"
+
+async def create_database(url: str)-> Tuple[AsyncEngine, async_sessionmaker]:
+    engine = create_async_engine(url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    return engine, async_sessionmaker(bind = engine, autoflush = False, expire_on_commit = False)
+
+class QueryCounter:
+    def __init__(self, engine: AsyncEngine)-> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args)-> None:
+        self.count += 1
+
+async def measure(
+        call: Callable[[], Awaitable],
+        counter: QueryCounter,
+        iterations: int
+)-> Dict[str, float]:
+    timings: List[float] = []
+    queries_before = counter.count
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        try:
+            await call()
+        except HTTPException:
+            pass
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "queries_per_call": (counter.count - queries_before) / iterations,
+        "mean_ms": sum(timings) / len(timings) * 1000
+    }
+
+def print_table(title: str, rows: List[Tuple[str, Dict[str, float]]])-> None:
+    print(title)
+    print(f"  {'case':<40}{'queries/call':>14}{'mean ms':>12}")
+    for name, result in rows:
+        print(f"  {name:<40}{result['queries_per_call']:>14.1f}{result['mean_ms']:>12.3f}")
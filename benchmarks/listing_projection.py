@@ -0,0 +1,62 @@
+import time
+import asyncio
+import argparse
+
+from benchmarks.common import (
+    create_database,
+    default_database_url
+)
+
+from app.database import models
+from app.schemas import user_schemas
+from app.services import crud_service
+from app.utils import serialization
+
+async def main(database_url: str, notes: int, body_size: int, limit: int, iterations: int)-> None:
+    engine, session_factory = await create_database(database_url)
+
+    async with session_factory() as db:
+        owner = models.User(email = "owner@example.com", password = "x")
+        db.add(owner)
+        await db.flush()
+
+        db.add_all([
+            models.Note(owner_id = owner.id, title = f"note {index}", content = f"{index} " + "lorem ipsum " * (body_size // 12))
+            for index in range(notes)
+        ])
+        await db.commit()
+
+        current_user = user_schemas.TokenData(id = owner.id, email = owner.email)
+
+        print(f"note listing projections ({engine.dialect.name}, {body_size} byte bodies, {limit} notes/page, {iterations} pages)")
+        print(f"  {'case':<40}{'mean ms':>12}{'bytes/page':>14}")
+
+        for name, view, fields in (
+            ("full", "full", None),
+            ("view=summary", "summary", None),
+            ("fields=id,title", "full", "id,title")
+        ):
+            selected = crud_service.listing_fields(view, fields)
+            await crud_service.read_all_notes(current_user, limit, None, db, selected)
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                page = await crud_service.read_all_notes(current_user, limit, None, db, selected)
+                page.pop("version")
+                body = serialization.dumps(page)
+            elapsed = time.perf_counter() - started
+
+            print(f"  {name:<40}{elapsed / iterations * 1000:>12.3f}{len(body):>14}")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Full note listings versus summary and field projections")
+    parser.add_argument("--database-url", default = default_database_url())
+    parser.add_argument("--notes", type = int, default = 500)
+    parser.add_argument("--body-size", type = int, default = 20000)
+    parser.add_argument("--limit", type = int, default = 50)
+    parser.add_argument("--iterations", type = int, default = 200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.database_url, args.notes, args.body_size, args.limit, args.iterations))
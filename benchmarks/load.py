@@ -0,0 +1,540 @@
+import time
+import random
+import asyncio
+import platform
+import itertools
+import subprocess
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from datetime import (
+    datetime,
+    timezone
+)
+
+import httpx
+
+from sqlalchemy import insert
+
+from benchmarks.search import (
+    build_vocabulary,
+    random_text
+)
+
+from app.main import app
+from app.utils import (
+    conditional,
+    utils
+)
+from app.database import models
+from app.core.security import create_access_token
+from app.database.models import Base
+from app.database.connection import (
+    AsyncSessionLocal,
+    engine
+)
+
+PASSWORD = "bench-password"
+
+Prepare = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+def percentile(sorted_values: List[float], fraction: float)-> float:
+    if not sorted_values:
+        return 0.0
+
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+
+    return sorted_values[index]
+
+def summarize(latencies: List[float], statuses: List[int], wall_seconds: float)-> Dict[str, Any]:
+    ordered = sorted(latencies)
+    status_counts: Dict[str, int] = {}
+    for status_code in statuses:
+        status_counts[str(status_code)] = status_counts.get(str(status_code), 0) + 1
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(1 for status_code in statuses if status_code >= 400),
+        "status_counts": status_counts,
+        "throughput_rps": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0
+    }
+
+def git_revision()-> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output = True,
+            text = True,
+            check = True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def bearer(user: Dict[str, Any])-> Dict[str, str]:
+    return {"Authorization": f"Bearer {user['token']}"}
+
+class LoadHarness:
+    def __init__(
+            self,
+            users: int,
+            notes_per_user: int,
+            grants_per_user: int,
+            seed: int
+    )-> None:
+        self.user_count = users
+        self.notes_per_user = notes_per_user
+        self.grants_per_user = grants_per_user
+        self.rng = random.Random(seed)
+        self.vocabulary = build_vocabulary(self.rng, 2000)
+        self.counter = itertools.count()
+        self.password_hash = ""
+        self.users: List[Dict[str, Any]] = []
+        self.grants: List[Tuple[Dict[str, Any], int, Dict[str, Any]]] = []
+        self.cursors: Dict[Tuple[str, int], str] = {}
+
+    def note_values(self, owner_id: int)-> Dict[str, Any]:
+        return {
+            "owner_id": owner_id,
+            "title": random_text(self.rng, self.vocabulary, 3)[:50],
+            "content": random_text(self.rng, self.vocabulary, 60)
+        }
+
+    async def insert_notes(self, owner_id: int, count: int)-> List[int]:
+        async with AsyncSessionLocal() as db:
+            ids = (
+                await db.scalars(
+                    insert(models.Note).returning(models.Note.id, sort_by_parameter_order = True),
+                    [self.note_values(owner_id) for _ in range(count)]
+                )
+            ).all()
+            await db.commit()
+
+        return list(ids)
+
+    async def insert_user(self)-> Dict[str, Any]:
+        email = f"bench-{next(self.counter)}@example.com"
+
+        async with AsyncSessionLocal() as db:
+            user_id = (
+                await db.execute(
+                    insert(models.User).values(email = email, password = self.password_hash).returning(models.User.id)
+                )
+            ).scalar_one()
+            await db.commit()
+
+        return {"id": user_id, "email": email}
+
+    async def insert_grant(self, owner: Dict[str, Any], note_id: int, reader: Dict[str, Any])-> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                insert(models.NoteReadAccess).values(
+                    user_id = reader["id"],
+                    note_owner_id = owner["id"],
+                    note_id = note_id
+                )
+            )
+            await db.commit()
+
+    async def seed(self)-> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await utils.init_db(engine)
+
+        self.password_hash = utils.hash_password(PASSWORD)
+
+        async with AsyncSessionLocal() as db:
+            emails = [f"user-{index}@example.com" for index in range(self.user_count)]
+            ids = (
+                await db.scalars(
+                    insert(models.User).returning(models.User.id, sort_by_parameter_order = True),
+                    [{"email": email, "password": self.password_hash} for email in emails]
+                )
+            ).all()
+            await db.commit()
+
+        self.users = [
+            {
+                "id": user_id,
+                "email": email,
+                "token": create_access_token({"id": user_id, "email": email}),
+                "notes": []
+            }
+            for user_id, email in zip(ids, emails)
+        ]
+
+        for user in self.users:
+            for start in range(0, self.notes_per_user, 1000):
+                user["notes"].extend(await self.insert_notes(user["id"], min(1000, self.notes_per_user - start)))
+
+        grants = []
+        for owner in self.users:
+            readers = [user for user in self.users if user is not owner]
+            for reader in self.rng.sample(readers, min(self.grants_per_user, len(readers))):
+                if owner["notes"]:
+                    grants.append((owner, self.rng.choice(owner["notes"]), reader))
+
+        async with AsyncSessionLocal() as db:
+            if grants:
+                await db.execute(
+                    insert(models.NoteReadAccess),
+                    [
+                        {"user_id": reader["id"], "note_owner_id": owner["id"], "note_id": note_id}
+                        for owner, note_id, reader in grants
+                    ]
+                )
+            await db.commit()
+
+        self.grants = grants
+
+    def owner_with_notes(self)-> Dict[str, Any]:
+        return self.rng.choice([user for user in self.users if user["notes"]] or self.users)
+
+    async def signup(self, context: Dict[str, Any])-> Dict[str, Any]:
+        return {
+            "method": "POST",
+            "url": "/auth/signup",
+            "json": {"email": f"signup-{next(self.counter)}@example.com", "password": PASSWORD}
+        }
+
+    async def login(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.rng.choice(self.users)
+
+        return {
+            "method": "POST",
+            "url": "/auth/login",
+            "data": {"username": user["email"], "password": PASSWORD, "grant_type": "password"}
+        }
+
+    async def delete_user(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = await self.insert_user()
+
+        return {
+            "method": "DELETE",
+            "url": "/auth/delete",
+            "data": {"username": user["email"], "password": PASSWORD, "grant_type": "password"}
+        }
+
+    async def create_note(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.rng.choice(self.users)
+        values = self.note_values(user["id"])
+
+        return {
+            "method": "POST",
+            "url": "/notes/create",
+            "headers": bearer(user),
+            "json": {"title": values["title"], "content": values["content"]}
+        }
+
+    async def read_note(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.owner_with_notes()
+
+        return {
+            "method": "GET",
+            "url": "/notes/read",
+            "headers": bearer(user),
+            "params": {"id": self.rng.choice(user["notes"])}
+        }
+
+    def follow_cursor(self, key: Tuple[str, int], sent: Optional[str], response: httpx.Response)-> None:
+        if response.status_code != 200:
+            return
+
+        next_cursor = response.json()["next_cursor"]
+        if next_cursor is not None and next_cursor == sent:
+            raise RuntimeError(f"{key[0]} returned the cursor it was given, so keyset paging is not advancing")
+
+        if next_cursor is None:
+            self.cursors.pop(key, None)
+        else:
+            self.cursors[key] = next_cursor
+
+    def next_page(self, url: str, user: Dict[str, Any], page_size: int)-> Dict[str, Any]:
+        key = (url, user["id"])
+        cursor = self.cursors.get(key)
+
+        return {
+            "method": "GET",
+            "url": url,
+            "headers": bearer(user),
+            "params": {"limit": page_size, **({"cursor": cursor} if cursor else {})},
+            "after": lambda response: self.follow_cursor(key, cursor, response)
+        }
+
+    async def read_all_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        return self.next_page("/notes/read-all", self.owner_with_notes(), context["page_size"])
+
+    async def read_all_notes_summary(self, context: Dict[str, Any])-> Dict[str, Any]:
+        return {
+            "method": "GET",
+            "url": "/notes/read-all",
+            "headers": bearer(self.owner_with_notes()),
+            "params": {"view": "summary"}
+        }
+
+    async def export_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        return {
+            "method": "GET",
+            "url": "/notes/export",
+            "headers": bearer(self.owner_with_notes())
+        }
+
+    async def update_note(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.owner_with_notes()
+
+        return {
+            "method": "PUT",
+            "url": "/notes/update",
+            "headers": bearer(user),
+            "params": {"id": self.rng.choice(user["notes"])},
+            "json": {"title": random_text(self.rng, self.vocabulary, 3)[:50]}
+        }
+
+    async def patch_note(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.rng.choice(self.users)
+        note_id = (await self.insert_notes(user["id"], 1))[0]
+
+        return {
+            "method": "PATCH",
+            "url": "/notes/update",
+            "headers": {**bearer(user), "If-Match": conditional.note_etag(note_id, 1)},
+            "params": {"id": note_id},
+            "json": {"content": random_text(self.rng, self.vocabulary, 20)}
+        }
+
+    async def delete_note(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.rng.choice(self.users)
+        note_id = (await self.insert_notes(user["id"], 1))[0]
+
+        return {
+            "method": "DELETE",
+            "url": "/notes/delete",
+            "headers": bearer(user),
+            "params": {"id": note_id}
+        }
+
+    async def create_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.rng.choice(self.users)
+
+        return {
+            "method": "POST",
+            "url": "/notes/batch-create",
+            "headers": bearer(user),
+            "json": [
+                {"title": values["title"], "content": values["content"]}
+                for values in (self.note_values(user["id"]) for _ in range(context["batch_size"]))
+            ]
+        }
+
+    async def update_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.owner_with_notes()
+        ids = self.rng.sample(user["notes"], min(context["batch_size"], len(user["notes"])))
+
+        return {
+            "method": "PUT",
+            "url": "/notes/batch-update",
+            "headers": bearer(user),
+            "json": [{"id": id, "content": random_text(self.rng, self.vocabulary, 20)} for id in ids]
+        }
+
+    async def delete_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        user = self.rng.choice(self.users)
+
+        return {
+            "method": "DELETE",
+            "url": "/notes/batch-delete",
+            "headers": bearer(user),
+            "json": await self.insert_notes(user["id"], context["batch_size"])
+        }
+
+    async def give_read_access(self, context: Dict[str, Any])-> Dict[str, Any]:
+        owner, reader = self.rng.sample(self.users, 2)
+        note_id = (await self.insert_notes(owner["id"], 1))[0]
+
+        return {
+            "method": "POST",
+            "url": "/notes/give-read-access",
+            "headers": bearer(owner),
+            "json": {"user_id": reader["id"], "note_id": note_id}
+        }
+
+    async def revoke_read_access(self, context: Dict[str, Any])-> Dict[str, Any]:
+        owner, reader = self.rng.sample(self.users, 2)
+        note_id = (await self.insert_notes(owner["id"], 1))[0]
+        await self.insert_grant(owner, note_id, reader)
+
+        return {
+            "method": "DELETE",
+            "url": "/notes/revoke-read-access",
+            "headers": bearer(owner),
+            "json": {"user_id": reader["id"], "note_id": note_id}
+        }
+
+    async def read_note_with_access(self, context: Dict[str, Any])-> Dict[str, Any]:
+        owner, note_id, reader = self.rng.choice(self.grants)
+
+        return {
+            "method": "POST",
+            "url": "/notes/read-note-with-access",
+            "headers": bearer(reader),
+            "json": {"user_id": owner["id"], "note_id": note_id}
+        }
+
+    async def read_shared_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        owner, note_id, reader = self.rng.choice(self.grants)
+
+        return self.next_page("/notes/shared-with-me", reader, context["page_size"])
+
+    async def search_notes(self, context: Dict[str, Any])-> Dict[str, Any]:
+        return {
+            "method": "GET",
+            "url": "/notes/search",
+            "headers": bearer(self.rng.choice(self.users)),
+            "params": {"q": self.rng.choice(self.vocabulary)}
+        }
+
+    def scenarios(self)-> Dict[str, Tuple[Prepare, bool]]:
+        return {
+            "POST /auth/signup": (self.signup, True),
+            "POST /auth/login": (self.login, True),
+            "DELETE /auth/delete": (self.delete_user, True),
+            "POST /notes/create": (self.create_note, False),
+            "GET /notes/read": (self.read_note, False),
+            "GET /notes/read-all": (self.read_all_notes, False),
+            "GET /notes/read-all?view=summary": (self.read_all_notes_summary, False),
+            "GET /notes/export": (self.export_notes, False),
+            "PUT /notes/update": (self.update_note, False),
+            "PATCH /notes/update": (self.patch_note, False),
+            "DELETE /notes/delete": (self.delete_note, False),
+            "POST /notes/batch-create": (self.create_notes, False),
+            "PUT /notes/batch-update": (self.update_notes, False),
+            "DELETE /notes/batch-delete": (self.delete_notes, False),
+            "POST /notes/give-read-access": (self.give_read_access, False),
+            "DELETE /notes/revoke-read-access": (self.revoke_read_access, False),
+            "POST /notes/read-note-with-access": (self.read_note_with_access, False),
+            "GET /notes/shared-with-me": (self.read_shared_notes, False),
+            "GET /notes/search": (self.search_notes, False)
+        }
+
+async def drive(
+        client: httpx.AsyncClient,
+        prepare: Prepare,
+        context: Dict[str, Any],
+        requests: int,
+        concurrency: int
+)-> Dict[str, Any]:
+    remaining = iter(range(requests))
+    latencies: List[float] = []
+    statuses: List[int] = []
+
+    async def worker()-> None:
+        for _ in remaining:
+            request = await prepare(context)
+            after = request.pop("after", None)
+
+            started = time.perf_counter()
+            response = await client.request(**request)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            statuses.append(response.status_code)
+
+            if after is not None:
+                after(response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+async def run(
+        users: int,
+        notes_per_user: int,
+        grants_per_user: int,
+        requests: int,
+        auth_requests: int,
+        concurrency: int,
+        batch_size: int,
+        page_size: int,
+        only: List[str],
+        seed: int
+)-> Dict[str, Any]:
+    harness = LoadHarness(users, notes_per_user, grants_per_user, seed)
+    context = {"batch_size": batch_size, "page_size": page_size}
+    results: Dict[str, Any] = {}
+
+    async with app.router.lifespan_context(app):
+        await harness.seed()
+
+        async with httpx.AsyncClient(transport = httpx.ASGITransport(app = app, raise_app_exceptions = False), base_url = "http://bench") as client:
+            for name, (prepare, is_auth) in harness.scenarios().items():
+                if only and not any(fragment in name for fragment in only):
+                    continue
+
+                results[name] = await drive(
+                    client,
+                    prepare,
+                    context,
+                    auth_requests if is_auth else requests,
+                    concurrency
+                )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "parameters": {
+            "users": users,
+            "notes_per_user": notes_per_user,
+            "grants_per_user": grants_per_user,
+            "requests": requests,
+            "auth_requests": auth_requests,
+            "concurrency": concurrency,
+            "batch_size": batch_size,
+            "page_size": page_size,
+            "seed": seed
+        },
+        "endpoints": results
+    }
+
+def print_report(report: Dict[str, Any])-> None:
+    parameters = report["parameters"]
+    print(
+        f"load run ({report['database']}, revision {report['revision']}, "
+        f"{parameters['users']} users x {parameters['notes_per_user']} notes, concurrency {parameters['concurrency']})"
+    )
+    print(f"  {'endpoint':<38}{'reqs':>6}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, result in report["endpoints"].items():
+        print(
+            f"  {name:<38}{result['requests']:>6}{result['errors']:>8}{result['throughput_rps']:>10.1f}"
+            f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float)-> List[str]:
+    regressions = []
+
+    for name, result in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+
+        if previous["p95_ms"] and result["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.2f} ms -> {result['p95_ms']:.2f} ms")
+        if previous["throughput_rps"] and result["throughput_rps"] < previous["throughput_rps"] * (1 - max_regression):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']:.1f} -> {result['throughput_rps']:.1f} req/s")
+        if result["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {result['errors']}")
+
+    return regressions
@@ -0,0 +1,75 @@
+import time
+import asyncio
+import argparse
+
+import benchmarks.common
+
+from fastapi import FastAPI
+
+from app.utils.metrics import (
+    HttpMetrics,
+    MetricsMiddleware
+)
+from app.api.auth_routes import auth_router
+from app.api.crud_routes import crud_router
+
+def build_app(instrumented: bool)-> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router)
+    app.include_router(crud_router)
+
+    @app.get("/health")
+    def health():
+        return {"message": "Healthy"}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware, routes = app.routes, metrics = HttpMetrics())
+
+    return app
+
+async def drive(app: FastAPI, iterations: int)-> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/health",
+        "raw_path": b"/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 80)
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+async def main(iterations: int)-> None:
+    plain = await drive(build_app(False), iterations)
+    instrumented = await drive(build_app(True), iterations)
+
+    print(f"metrics middleware overhead ({iterations} requests to /health, routes resolved against both routers)")
+    print(f"  {'case':<40}{'us/request':>14}")
+    print(f"  {'without metrics':<40}{plain:>14.1f}")
+    print(f"  {'with metrics':<40}{instrumented:>14.1f}")
+    print(f"  {'overhead':<40}{instrumented - plain:>14.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Per-request cost of the Prometheus metrics middleware")
+    parser.add_argument("--iterations", type = int, default = 20000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,87 @@
+import asyncio
+import argparse
+
+from benchmarks.common import (
+    QueryCounter,
+    create_database,
+    default_database_url,
+    measure,
+    print_table
+)
+from benchmarks.resp_standin import start_standin
+
+from app.database import models
+from app.schemas import (
+    crud_schemas,
+    user_schemas
+)
+from app.services import crud_service
+from app.services.note_cache import note_cache
+from app.utils.cache import (
+    MemoryCacheBackend,
+    NullCacheBackend,
+    RedisCacheBackend
+)
+
+async def main(database_url: str, redis_url: str, iterations: int)-> None:
+    engine, session_factory = await create_database(database_url)
+    counter = QueryCounter(engine)
+
+    standin = None
+    if not redis_url:
+        standin = await start_standin()
+        host, port = standin.sockets[0].getsockname()[:2]
+        redis_url = f"redis://{host}:{port}/0"
+
+    backends = {
+        "no cache": NullCacheBackend(),
+        "memory": MemoryCacheBackend(max_size = 10000, ttl_seconds = 60),
+        "redis": RedisCacheBackend(redis_url)
+    }
+
+    async with session_factory() as db:
+        owner = models.User(email = "owner@example.com", password = "x")
+        reader = models.User(email = "reader@example.com", password = "x")
+        db.add_all([owner, reader])
+        await db.flush()
+
+        shared = models.Note(owner_id = owner.id, title = "shared", content = "body " * 200)
+        db.add(shared)
+        await db.flush()
+
+        db.add(models.NoteReadAccess(user_id = reader.id, note_owner_id = owner.id, note_id = shared.id))
+        await db.commit()
+
+        owner_user = user_schemas.TokenData(id = owner.id, email = owner.email)
+        reader_user = user_schemas.TokenData(id = reader.id, email = reader.email)
+        readable = crud_schemas.ReadableNote(user_id = owner.id, note_id = shared.id)
+
+        rows = []
+        for name, backend in backends.items():
+            note_cache.backend = backend
+            rows.append((
+                f"read_note / {name}",
+                await measure(lambda: crud_service.read_note(shared.id, owner_user, db), counter, iterations)
+            ))
+            rows.append((
+                f"read_note_with_access / {name}",
+                await measure(lambda: crud_service.read_note_with_access(readable, reader_user, db), counter, iterations)
+            ))
+            await backend.close()
+
+    print_table(f"note cache ({engine.dialect.name}, {iterations} iterations)", rows)
+    print(f"  counters: {note_cache.snapshot()}")
+
+    if standin is not None:
+        standin.close()
+        await standin.wait_closed()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Single-note reads with and without the read-through note cache")
+    parser.add_argument("--database-url", default = default_database_url())
+    parser.add_argument("--redis-url", default = None, help = "defaults to an in-process RESP stand-in")
+    parser.add_argument("--iterations", type = int, default = 1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.database_url, args.redis_url, args.iterations))
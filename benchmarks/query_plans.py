@@ -0,0 +1,275 @@
+import sys
+import json
+import asyncio
+import argparse
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from fastapi import HTTPException
+
+from sqlalchemy import (
+    event,
+    insert,
+    select
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
+
+from benchmarks.run import LocalPostgres
+
+from app.database import models
+from app.database.migrate import (
+    migrate,
+    schema_migrations
+)
+from app.schemas import (
+    crud_schemas,
+    user_schemas
+)
+from app.services import (
+    crud_service,
+    search_service
+)
+from app.services.note_cache import note_cache
+from app.utils.cache import NullCacheBackend
+
+class StatementRecorder:
+    def __init__(self, engine: AsyncEngine)-> None:
+        self.label: Optional[str] = None
+        self.statements: Dict[str, Tuple[str, Any]] = {}
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, *args)-> None:
+        if self.label is None:
+            return
+
+        if isinstance(parameters, list):
+            parameters = parameters[0]
+
+        self.statements.setdefault(statement, (self.label, parameters))
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+def full_scans(plan: Dict[str, Any])-> List[str]:
+    found = []
+
+    if plan["Node Type"] == "Seq Scan":
+        found.append(plan["Relation Name"])
+    elif plan["Node Type"] in INDEX_SCANS and "Index Cond" not in plan:
+        found.append(plan["Index Name"])
+
+    for child in plan.get("Plans", []):
+        found.extend(full_scans(child))
+
+    return found
+
+async def seed(session_factory: async_sessionmaker, users: int, notes_per_user: int)-> Tuple[List[int], List[int]]:
+    async with session_factory() as db:
+        user_ids = (
+            await db.scalars(
+                insert(models.User).returning(models.User.id, sort_by_parameter_order = True),
+                [{"email": f"user-{index}@example.com", "password": "x"} for index in range(users)]
+            )
+        ).all()
+
+        await db.execute(
+            insert(models.Note),
+            [
+                {"owner_id": user_id, "title": f"note {index}", "content": f"body {index} " * 20}
+                for user_id in user_ids
+                for index in range(notes_per_user)
+            ]
+        )
+
+        notes = (await db.execute(select(models.Note.id, models.Note.owner_id).order_by(models.Note.id))).all()
+        shared = [notes[0]] + [notes[len(notes) * step // 10 - 1] for step in range(1, 11)]
+
+        await db.execute(
+            insert(models.NoteReadAccess),
+            [
+                {"user_id": reader_id, "note_owner_id": owner_id, "note_id": note_id}
+                for reader_id in user_ids[1:]
+                for note_id, owner_id in shared
+                if owner_id != reader_id
+            ]
+        )
+        await db.commit()
+
+    return list(user_ids), [note_id for note_id, owner_id in notes if owner_id == user_ids[0]]
+
+def scenarios(
+        user_ids: List[int],
+        owner_notes: List[int]
+)-> List[Tuple[str, Callable[[AsyncSession], Awaitable[Any]]]]:
+    owner = user_schemas.TokenData(id = user_ids[0], email = "user-0@example.com")
+    reader = user_schemas.TokenData(id = user_ids[1], email = "user-1@example.com")
+    stranger = user_ids[2]
+
+    async def paginate(db: AsyncSession)-> None:
+        page = await crud_service.read_all_notes(owner, 5, None, db)
+        await crud_service.read_all_notes(owner, 5, page["next_cursor"], db, crud_service.NOTE_SUMMARY_FIELDS)
+
+    async def paginate_shared(db: AsyncSession)-> None:
+        page = await crud_service.read_shared_notes(reader, 5, None, db)
+        await crud_service.read_shared_notes(reader, 5, page["next_cursor"], db)
+
+    async def export(db: AsyncSession)-> None:
+        async for _ in crud_service.export_notes(owner, db):
+            pass
+
+    return [
+        ("create_note", lambda db: crud_service.create_note(crud_schemas.CreateNote(title = "plan check"), owner, db)),
+        ("read_note", lambda db: crud_service.read_note(owner_notes[0], owner, db)),
+        ("read_note_version", lambda db: crud_service.read_note_version(owner_notes[0], owner, db)),
+        ("read_all_notes", paginate),
+        ("export_notes", export),
+        ("update_note", lambda db: crud_service.update_note(owner_notes[0], crud_schemas.UpdateNote(title = "changed"), owner, db)),
+        ("update_note without changes", lambda db: crud_service.update_note(owner_notes[0], crud_schemas.UpdateNote(), owner, db)),
+        (
+            "patch_note",
+            lambda db: crud_service.patch_note(owner_notes[1], crud_schemas.PatchNote(content = None), [1], owner, db)
+        ),
+        (
+            "patch_note conflict",
+            lambda db: crud_service.patch_note(owner_notes[1], crud_schemas.PatchNote(content = None), [1], owner, db)
+        ),
+        ("delete_note", lambda db: crud_service.delete_note(owner_notes[-1], owner, db)),
+        ("create_notes", lambda db: crud_service.create_notes([crud_schemas.CreateNote(title = "batch")] * 3, owner, db)),
+        (
+            "update_notes",
+            lambda db: crud_service.update_notes(
+                [crud_schemas.BatchUpdateNote(id = id, title = "batch") for id in owner_notes[10:13]],
+                owner,
+                db
+            )
+        ),
+        ("delete_notes", lambda db: crud_service.delete_notes(owner_notes[-4:-1], owner, db)),
+        (
+            "give_read_access",
+            lambda db: crud_service.give_read_access(
+                crud_schemas.CreateNoteReadAccess(user_id = stranger, note_id = owner_notes[20]),
+                owner,
+                db
+            )
+        ),
+        (
+            "give_read_access conflict",
+            lambda db: crud_service.give_read_access(
+                crud_schemas.CreateNoteReadAccess(user_id = stranger, note_id = owner_notes[20]),
+                owner,
+                db
+            )
+        ),
+        (
+            "revoke_read_access",
+            lambda db: crud_service.revoke_read_access(
+                crud_schemas.DeleteNoteReadAccess(user_id = stranger, note_id = owner_notes[20]),
+                owner,
+                db
+            )
+        ),
+        (
+            "read_note_with_access",
+            lambda db: crud_service.read_note_with_access(
+                crud_schemas.ReadableNote(user_id = owner.id, note_id = owner_notes[0]),
+                reader,
+                db
+            )
+        ),
+        (
+            "read_note_with_access denied",
+            lambda db: crud_service.read_note_with_access(
+                crud_schemas.ReadableNote(user_id = owner.id, note_id = owner_notes[30]),
+                reader,
+                db
+            )
+        ),
+        ("read_shared_notes", paginate_shared),
+        ("search_notes", lambda db: search_service.search_notes("plan check", owner, 20, 0, db))
+    ]
+
+async def main(database_url: str, users: int, notes_per_user: int)-> int:
+    engine = create_async_engine(database_url)
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("the plan check needs PostgreSQL; pass a postgresql+asyncpg URL or --start-postgres")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.drop_all)
+        await conn.run_sync(schema_migrations.drop, checkfirst = True)
+    await migrate(engine)
+
+    session_factory = async_sessionmaker(bind = engine, autoflush = False, expire_on_commit = False)
+    user_ids, owner_notes = await seed(session_factory, users, notes_per_user)
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level = "AUTOCOMMIT")
+        await conn.exec_driver_sql("ANALYZE")
+
+    note_cache.backend = NullCacheBackend()
+    recorder = StatementRecorder(engine)
+
+    for label, scenario in scenarios(user_ids, owner_notes):
+        recorder.label = label
+        async with session_factory() as db:
+            try:
+                await scenario(db)
+            except HTTPException:
+                pass
+        recorder.label = None
+
+    failures = 0
+    print(f"query plans ({len(recorder.statements)} statements, {users} users x {notes_per_user} notes, enable_seqscan = off)")
+
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+
+        for statement, (label, parameters) in recorder.statements.items():
+            raw = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            scanned = full_scans(plan)
+
+            print(f"  {'FULL SCAN' if scanned else 'ok':<11}{label:<32}{', '.join(scanned)}")
+            if scanned:
+                failures += 1
+                print(f"    {statement}")
+
+        await conn.rollback()
+
+    await engine.dispose()
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Fail if any crud_service or search_service query scans a whole table or index on the migrated schema")
+    parser.add_argument("--database-url", help = "postgresql+asyncpg URL; its tables are dropped and re-created")
+    parser.add_argument("--start-postgres", action = "store_true", help = "initdb and start a throwaway local Postgres")
+    parser.add_argument("--users", type = int, default = 20)
+    parser.add_argument("--notes-per-user", type = int, default = 200)
+    args = parser.parse_args()
+
+    postgres = LocalPostgres() if args.start_postgres else None
+
+    try:
+        database_url = postgres.start() if postgres else args.database_url
+        if not database_url:
+            raise SystemExit("pass --database-url or --start-postgres")
+
+        exit_code = asyncio.run(main(database_url, args.users, args.notes_per_user))
+    finally:
+        if postgres is not None:
+            postgres.stop()
+
+    sys.exit(exit_code)
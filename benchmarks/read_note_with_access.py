@@ -0,0 +1,108 @@
+import asyncio
+import argparse
+
+from benchmarks.common import (
+    QueryCounter,
+    create_database,
+    default_database_url,
+    measure,
+    print_table
+)
+
+from fastapi import (
+    HTTPException,
+    status
+)
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import models
+from app.schemas import (
+    crud_schemas,
+    user_schemas
+)
+from app.services import crud_service
+
+async def legacy_read_note_with_access(
+        note: crud_schemas.ReadableNote,
+        current_user: user_schemas.TokenData,
+        db: AsyncSession
+)-> models.Note:
+    existing_user = (
+        await db.execute(select(models.User).where(models.User.id == note.user_id))
+    ).scalar_one_or_none()
+    if not existing_user:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "User does not exist")
+
+    existing_note = (
+        await db.execute(select(models.Note).where(models.Note.id == note.note_id))
+    ).scalar_one_or_none()
+    if not existing_note:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "Note does not exist")
+
+    note_read_access = (
+        await db.execute(
+            select(models.NoteReadAccess).where(
+                models.NoteReadAccess.note_id == note.note_id,
+                models.NoteReadAccess.user_id == current_user.id,
+                models.NoteReadAccess.note_owner_id == note.user_id
+            )
+        )
+    ).scalar_one_or_none()
+    if not note_read_access:
+        raise HTTPException(status_code = status.HTTP_403_FORBIDDEN, detail = "You do not have read access to this note")
+
+    return (
+        await db.execute(
+            select(models.Note).where(models.Note.id == note.note_id, models.Note.owner_id == note.user_id)
+        )
+    ).scalar_one()
+
+async def main(database_url: str, iterations: int)-> None:
+    engine, session_factory = await create_database(database_url)
+    counter = QueryCounter(engine)
+
+    async with session_factory() as db:
+        owner = models.User(email = "owner@example.com", password = "x")
+        reader = models.User(email = "reader@example.com", password = "x")
+        db.add_all([owner, reader])
+        await db.flush()
+
+        shared = models.Note(owner_id = owner.id, title = "shared", content = "body")
+        private = models.Note(owner_id = owner.id, title = "private", content = "body")
+        db.add_all([shared, private])
+        await db.flush()
+
+        db.add(models.NoteReadAccess(user_id = reader.id, note_owner_id = owner.id, note_id = shared.id))
+        await db.commit()
+
+        current_user = user_schemas.TokenData(id = reader.id, email = reader.email)
+        cases = {
+            "granted": crud_schemas.ReadableNote(user_id = owner.id, note_id = shared.id),
+            "not granted (403)": crud_schemas.ReadableNote(user_id = owner.id, note_id = private.id)
+        }
+
+        rows = []
+        for name, note in cases.items():
+            for label, implementation in (
+                ("legacy", legacy_read_note_with_access),
+                ("joined", crud_service.read_note_with_access)
+            ):
+                result = await measure(
+                    lambda: implementation(note, current_user, db),
+                    counter,
+                    iterations
+                )
+                rows.append((f"{name} / {label}", result))
+
+    print_table(f"read_note_with_access ({engine.dialect.name}, {iterations} iterations)", rows)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Round trips per shared-note read, before and after the joined query")
+    parser.add_argument("--database-url", default = default_database_url())
+    parser.add_argument("--iterations", type = int, default = 500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.database_url, args.iterations))
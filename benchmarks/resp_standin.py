@@ -0,0 +1,125 @@
+import time
+import fnmatch
+import asyncio
+import argparse
+
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from app.utils.cache import (
+    SET_IF_NEWER_SCRIPT,
+    unpack_ranked
+)
+
+class RespStandIn:
+    def __init__(self)-> None:
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes)-> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+
+        return value
+
+    def handle(self, command: List[bytes])-> bytes:
+        name = command[0].upper()
+        args = command[1:]
+
+        if name in (b"PING", b"AUTH", b"SELECT"):
+            return b"+OK\r\n" if name != b"PING" else b"+PONG\r\n"
+        if name == b"GET":
+            return bulk(self._get(args[0]))
+        if name == b"MGET":
+            return b"*%d\r\n" % len(args) + b"".join(bulk(self._get(key)) for key in args)
+        if name == b"SET":
+            expires_at = None
+            if len(args) >= 4 and args[2].upper() == b"PX":
+                expires_at = time.monotonic() + int(args[3]) / 1000
+            elif len(args) >= 4 and args[2].upper() == b"EX":
+                expires_at = time.monotonic() + int(args[3])
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if name == b"EVAL":
+            if args[0].decode("utf-8") != SET_IF_NEWER_SCRIPT:
+                return b"-ERR only the set_if_newer script is supported\r\n"
+
+            key_count = int(args[1])
+            keys, argv = args[2:2 + key_count], args[2 + key_count:]
+            if key_count > 1 and self._get(keys[1]) is not None:
+                return b":0\r\n"
+
+            key, value, rank, ttl_ms = keys[0], argv[0], int(argv[1]), int(argv[2])
+            current = self._get(key)
+            if current is not None:
+                current_rank, _ = unpack_ranked(current)
+                if current_rank is not None and current_rank >= rank:
+                    return b":0\r\n"
+
+            self.data[key] = (value, time.monotonic() + ttl_ms / 1000)
+            return b":1\r\n"
+        if name == b"DEL":
+            removed = sum(1 for key in args if self.data.pop(key, None) is not None)
+            return b":%d\r\n" % removed
+        if name == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode("utf-8") if b"MATCH" in args else "*"
+            keys = [key for key in list(self.data) if fnmatch.fnmatchcase(key.decode("utf-8"), pattern)]
+            return b"*2\r\n" + bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(bulk(key) for key in keys)
+        if name == b"FLUSHDB":
+            self.data.clear()
+            return b"+OK\r\n"
+
+        return b"-ERR unknown command '%s'\r\n" % name
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter)-> None:
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+
+                command = []
+                for _ in range(int(header[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    command.append((await reader.readexactly(length + 2))[:-2])
+
+                writer.write(self.handle(command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+def bulk(value: Optional[bytes])-> bytes:
+    if value is None:
+        return b"$-1\r\n"
+
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+async def start_standin(host: str = "127.0.0.1", port: int = 0)-> asyncio.Server:
+    return await asyncio.start_server(RespStandIn().serve_client, host, port)
+
+async def main(host: str, port: int)-> None:
+    server = await start_standin(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"RESP stand-in listening on redis://{address[0]}:{address[1]}/0")
+
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Minimal in-process Redis protocol server for local cache runs")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 6390)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.host, args.port))
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+from typing import Optional
+
+from benchmarks.common import default_database_url
+
+class LocalPostgres:
+    def __init__(self)-> None:
+        self.directory = tempfile.mkdtemp(prefix = "notes-api-pg-")
+        self.data_directory = os.path.join(self.directory, "data")
+        self.pg_ctl: Optional[str] = None
+
+    def _free_port(self)-> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def start(self)-> str:
+        initdb = shutil.which("initdb")
+        self.pg_ctl = shutil.which("pg_ctl")
+        if initdb is None or self.pg_ctl is None:
+            raise SystemExit("initdb and pg_ctl must be on PATH for --start-postgres; pass --database-url instead")
+
+        port = self._free_port()
+        subprocess.run(
+            [initdb, "-D", self.data_directory, "-U", "postgres", "--auth", "trust"],
+            check = True,
+            stdout = subprocess.DEVNULL
+        )
+        subprocess.run(
+            [
+                self.pg_ctl, "-D", self.data_directory,
+                "-o", f"-h 127.0.0.1 -p {port} -k {self.directory}",
+                "-l", os.path.join(self.directory, "server.log"),
+                "-w", "start"
+            ],
+            check = True,
+            stdout = subprocess.DEVNULL
+        )
+
+        return f"postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres"
+
+    def stop(self)-> None:
+        if self.pg_ctl is not None and os.path.isdir(self.data_directory):
+            subprocess.run(
+                [self.pg_ctl, "-D", self.data_directory, "-m", "fast", "-w", "stop"],
+                stdout = subprocess.DEVNULL
+            )
+        shutil.rmtree(self.directory, ignore_errors = True)
+
+def main(args: argparse.Namespace)-> int:
+    postgres = LocalPostgres() if args.start_postgres else None
+
+    if not (args.reset or postgres or args.database_url == default_database_url()):
+        raise SystemExit(f"refusing to drop every table in {args.database_url}; pass --reset to allow it")
+
+    try:
+        os.environ["DATABASE_URL"] = postgres.start() if postgres else args.database_url
+
+        from benchmarks import load
+
+        report = asyncio.run(load.run(
+            users = args.users,
+            notes_per_user = args.notes_per_user,
+            grants_per_user = args.grants_per_user,
+            requests = args.requests,
+            auth_requests = args.auth_requests,
+            concurrency = args.concurrency,
+            batch_size = args.batch_size,
+            page_size = args.page_size,
+            only = args.only,
+            seed = args.seed
+        ))
+    finally:
+        if postgres is not None:
+            postgres.stop()
+
+    load.print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent = 2)
+        print(f"  wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            baseline_report = json.load(baseline)
+
+        if baseline_report.get("database") != report["database"]:
+            print(f"  warning: baseline ran on {baseline_report.get('database')}, this run on {report['database']}")
+
+        regressions = load.compare(report, baseline_report, args.max_regression)
+
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Seed a database and drive every API route concurrently through an ASGI client")
+    parser.add_argument("--database-url", default = default_database_url(), help = "database to seed; all of its tables are dropped first")
+    parser.add_argument(
+        "--reset",
+        action = "store_true",
+        help = "allow dropping every table in --database-url; not needed for the default scratch SQLite file or --start-postgres"
+    )
+    parser.add_argument("--start-postgres", action = "store_true", help = "initdb and start a throwaway local Postgres")
+    parser.add_argument("--users", type = int, default = 50)
+    parser.add_argument("--notes-per-user", type = int, default = 100)
+    parser.add_argument("--grants-per-user", type = int, default = 5)
+    parser.add_argument("--requests", type = int, default = 500, help = "requests per note endpoint")
+    parser.add_argument("--auth-requests", type = int, default = 40, help = "requests per bcrypt-bound auth endpoint")
+    parser.add_argument("--concurrency", type = int, default = 16)
+    parser.add_argument("--batch-size", type = int, default = 20)
+    parser.add_argument("--page-size", type = int, default = 10, help = "limit for read-all and shared-with-me, which follow next_cursor")
+    parser.add_argument("--only", action = "append", default = [], help = "only run endpoints whose name contains this; repeatable")
+    parser.add_argument("--seed", type = int, default = 42)
+    parser.add_argument("--output", help = "write the JSON report here")
+    parser.add_argument("--baseline", help = "JSON report to compare against; exits 1 on regression")
+    parser.add_argument("--max-regression", type = float, default = 0.25)
+    args = parser.parse_args()
+
+    sys.exit(main(args))
@@ -0,0 +1,90 @@
+import random
+import asyncio
+import argparse
+
+from benchmarks.common import (
+    QueryCounter,
+    create_database,
+    default_database_url,
+    measure,
+    print_table
+)
+
+from sqlalchemy import (
+    insert,
+    select
+)
+
+from app.database import models
+from app.schemas import user_schemas
+from app.services import search_service
+
+SYLLABLES = "ba ko ri nu te sa mi lo ve da".split()
+
+def build_vocabulary(rng: random.Random, size: int)-> list:
+    return sorted({"".join(rng.choice(SYLLABLES) for _ in range(4)) for _ in range(size)})
+
+def random_text(rng: random.Random, vocabulary: list, words: int)-> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+async def main(database_url: str, notes: int, iterations: int)-> None:
+    rng = random.Random(42)
+    vocabulary = build_vocabulary(rng, 5000)
+    engine, session_factory = await create_database(database_url)
+    counter = QueryCounter(engine)
+
+    async with session_factory() as db:
+        user = models.User(email = "search@example.com", password = "x")
+        db.add(user)
+        await db.flush()
+
+        for start in range(0, notes, 1000):
+            await db.execute(
+                insert(models.Note),
+                [
+                    {
+                        "owner_id": user.id,
+                        "title": random_text(rng, vocabulary, 3),
+                        "content": random_text(rng, vocabulary, 60)
+                    }
+                    for _ in range(start, min(start + 1000, notes))
+                ]
+            )
+        await db.commit()
+
+        current_user = user_schemas.TokenData(id = user.id, email = user.email)
+
+        async def download_and_filter(terms: list)-> None:
+            rows = (
+                await db.execute(
+                    select(models.Note.id, models.Note.title, models.Note.content)
+                    .where(models.Note.owner_id == user.id)
+                )
+            ).all()
+            [
+                row.id for row in rows
+                if all(term in f"{row.title} {row.content}".split() for term in terms)
+            ]
+
+        rows = []
+        for term in (vocabulary[10], f"{vocabulary[20]} {vocabulary[30]}"):
+            rows.append((
+                f"'{term}' / full-text index",
+                await measure(lambda: search_service.search_notes(term, current_user, 20, 0, db), counter, iterations)
+            ))
+            rows.append((
+                f"'{term}' / download and filter",
+                await measure(lambda: download_and_filter(term.split()), counter, iterations)
+            ))
+
+    print_table(f"search ({engine.dialect.name}, {notes} notes, {iterations} iterations)", rows)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Ranked full-text search versus downloading and filtering every note")
+    parser.add_argument("--database-url", default = default_database_url())
+    parser.add_argument("--notes", type = int, default = 20000)
+    parser.add_argument("--iterations", type = int, default = 50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.database_url, args.notes, args.iterations))
@@ -0,0 +1,111 @@
+import json
+import time
+import asyncio
+import argparse
+
+from typing import (
+    Awaitable,
+    Callable,
+    Dict
+)
+
+from benchmarks.common import (
+    create_database,
+    default_database_url
+)
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import models
+from app.schemas import user_schemas
+from app.services import crud_service
+from app.utils import (
+    responses,
+    serialization
+)
+
+async def legacy_read_all_notes(
+        current_user: user_schemas.TokenData,
+        limit: int,
+        db: AsyncSession
+)-> bytes:
+    notes = (
+        await db.scalars(
+            select(models.Note)
+            .where(models.Note.owner_id == current_user.id)
+            .order_by(models.Note.updated_at.desc(), models.Note.id.desc())
+            .limit(limit + 1)
+        )
+    ).all()
+
+    page = responses.NotePage.model_validate({"items": notes[:limit], "next_cursor": None})
+
+    return json.dumps(page.model_dump(mode = "json"), separators = (",", ":")).encode("utf-8")
+
+async def fast_read_all_notes(
+        current_user: user_schemas.TokenData,
+        limit: int,
+        db: AsyncSession
+)-> bytes:
+    notes = await crud_service.read_all_notes(current_user, limit, None, db)
+    notes.pop("version")
+
+    return serialization.dumps(notes)
+
+async def run(call: Callable[[], Awaitable[bytes]], iterations: int, limit: int)-> Dict[str, float]:
+    await call()
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        await call()
+    cpu_seconds = time.process_time() - cpu_started
+    wall_seconds = time.perf_counter() - wall_started
+
+    return {
+        "pages_per_second": iterations / wall_seconds,
+        "cpu_ms_per_note": cpu_seconds / (iterations * limit) * 1000
+    }
+
+async def main(database_url: str, notes: int, limit: int, iterations: int)-> None:
+    engine, session_factory = await create_database(database_url)
+
+    async with session_factory() as db:
+        owner = models.User(email = "owner@example.com", password = "x")
+        db.add(owner)
+        await db.flush()
+
+        db.add_all([
+            models.Note(owner_id = owner.id, title = f"note {index}", content = "body " * 40)
+            for index in range(notes)
+        ])
+        await db.commit()
+
+        current_user = user_schemas.TokenData(id = owner.id, email = owner.email)
+
+        legacy_body = await legacy_read_all_notes(current_user, limit, db)
+        fast_body = await fast_read_all_notes(current_user, limit, db)
+        assert json.loads(legacy_body)["items"] == json.loads(fast_body)["items"]
+
+        rows = [
+            ("ORM + pydantic + json", await run(lambda: legacy_read_all_notes(current_user, limit, db), iterations, limit)),
+            ("column tuples + orjson", await run(lambda: fast_read_all_notes(current_user, limit, db), iterations, limit))
+        ]
+
+    print(f"read-all serialization ({engine.dialect.name}, {limit} notes/page, {iterations} pages)")
+    print(f"  {'case':<40}{'pages/s':>12}{'cpu ms/note':>14}")
+    for name, result in rows:
+        print(f"  {name:<40}{result['pages_per_second']:>12.1f}{result['cpu_ms_per_note']:>14.4f}")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Listing serialization via ORM models and pydantic versus column tuples and orjson")
+    parser.add_argument("--database-url", default = default_database_url())
+    parser.add_argument("--notes", type = int, default = 1000)
+    parser.add_argument("--limit", type = int, default = 200)
+    parser.add_argument("--iterations", type = int, default = 200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.database_url, args.notes, args.limit, args.iterations))
@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+
+from typing import (
+    Dict,
+    List,
+    Tuple
+)
+
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from benchmarks.common import (
+    create_database,
+    default_database_url
+)
+
+from sqlalchemy import insert
+
+from app.database import models
+from app.core.security import create_access_token
+
+def free_port()-> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def seed(database_url: str, notes: int)-> str:
+    engine, session_factory = await create_database(database_url)
+
+    async with session_factory() as db:
+        owner = models.User(email = "owner@example.com", password = "x")
+        db.add(owner)
+        await db.flush()
+
+        await db.execute(
+            insert(models.Note),
+            [{"owner_id": owner.id, "title": f"note {index}", "content": "body " * 40} for index in range(notes)]
+        )
+        await db.commit()
+
+        token = create_access_token({"id": owner.id, "email": owner.email})
+
+    await engine.dispose()
+
+    return token
+
+async def hammer(url: str, token: str, duration: float, concurrency: int)-> Tuple[int, List[float]]:
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(headers = {"Authorization": f"Bearer {token}"}, timeout = 30) as client:
+        async def worker()-> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return len(latencies), latencies
+
+def client_process(url: str, token: str, duration: float, concurrency: int)-> Tuple[int, List[float]]:
+    return asyncio.run(hammer(url, token, duration, concurrency))
+
+def start_server(workers: int, port: int, environment: Dict[str, str])-> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env = {
+            **environment,
+            "SERVER_HOST": "127.0.0.1",
+            "SERVER_PORT": str(port),
+            "SERVER_WORKERS": str(workers),
+            "SERVER_ACCESS_LOG": "false",
+            "METRICS_ENABLED": "false"
+        },
+        stdout = subprocess.DEVNULL,
+        stderr = subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/ready").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+
+    server.terminate()
+    raise SystemExit(f"server with {workers} workers did not become ready")
+
+def main(
+        database_url: str,
+        worker_counts: List[int],
+        clients: int,
+        concurrency: int,
+        duration: float,
+        path: str
+)-> None:
+    token = asyncio.run(seed(database_url, 200))
+    environment = {**os.environ, "DATABASE_URL": database_url}
+
+    print(f"worker scaling ({path}, {clients} client processes x {concurrency} connections, {duration:.0f}s per run, {os.cpu_count()} CPUs)")
+    print(f"  {'workers':<10}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'speedup':>10}")
+
+    baseline = None
+    for workers in worker_counts:
+        port = free_port()
+        server = start_server(workers, port, environment)
+
+        try:
+            with ProcessPoolExecutor(max_workers = clients) as pool:
+                results = list(pool.map(
+                    client_process,
+                    [f"http://127.0.0.1:{port}{path}"] * clients,
+                    [token] * clients,
+                    [duration] * clients,
+                    [concurrency] * clients
+                ))
+        finally:
+            server.terminate()
+            server.wait(timeout = 60)
+
+        latencies = sorted(latency for _, sample in results for latency in sample)
+        throughput = sum(count for count, _ in results) / duration
+        baseline = baseline or throughput
+
+        print(
+            f"  {workers:<10}{throughput:>12.1f}"
+            f"{latencies[len(latencies) // 2] * 1000:>10.2f}"
+            f"{latencies[int(len(latencies) * 0.99)] * 1000:>10.2f}"
+            f"{throughput / baseline:>10.2f}x"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Throughput of python -m app.server as workers are added")
+    parser.add_argument("--database-url", default = default_database_url())
+    parser.add_argument("--workers", type = int, nargs = "+", default = [1, 2, 4])
+    parser.add_argument("--clients", type = int, default = 2, help = "load generator processes")
+    parser.add_argument("--concurrency", type = int, default = 32, help = "connections per load generator")
+    parser.add_argument("--duration", type = float, default = 10.0)
+    parser.add_argument("--path", default = "/notes/read-all?view=summary&limit=20")
+    args = parser.parse_args()
+
+    main(args.database_url, args.workers, args.clients, args.concurrency, args.duration, args.path)